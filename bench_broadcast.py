@@ -0,0 +1,99 @@
+"""Microbenchmark for the scoreboard broadcast path.
+
+Measures CPU time per broadcast as the viewer count grows, for the
+Broadcaster in server.py (each change is JSON encoded once and the same
+frame goes to every viewer) against the same broadcaster encoding the
+payload again for every viewer, which is what send_json per viewer did.
+
+    python bench_broadcast.py
+    python bench_broadcast.py --viewers 10 100 1000 --players 50 --rounds 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import server
+
+
+class FakeWebSocket:
+    """Stands in for a starlette WebSocket, counts what would be sent."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_text(self, data):
+        self.frames += 1
+        self.bytes += len(data)
+
+    async def close(self, code=1000):
+        pass
+
+
+class PerViewerEncodeBroadcaster(server.Broadcaster):
+    """Hands every viewer the payload without a frame, so each encodes it."""
+
+    def flush(self):
+        self.flush_handle = None
+        changed, self.changed = self.changed, {}
+        for viewer in list(self.viewers.values()):
+            viewer.offer("scores", changed, None)
+
+
+def make_scores(players):
+    return {f"player_{i + 1}": str(i * 12) for i in range(players)}
+
+
+async def wait_drained(broadcaster):
+    while any(viewer.outbox for viewer in broadcaster.viewers.values()):
+        await asyncio.sleep(0)
+
+
+async def bench(broadcaster_class, viewers, players, rounds):
+    scores = make_scores(players)
+    broadcaster = broadcaster_class(scores, tick=0)
+    for _ in range(viewers):
+        broadcaster.add(FakeWebSocket())
+    await wait_drained(broadcaster)
+
+    start = time.process_time()
+    for r in range(rounds):
+        scores["player_1"] = str(r)
+        broadcaster.publish_scores(scores)
+        await wait_drained(broadcaster)
+    elapsed = (time.process_time() - start) / rounds
+
+    broadcaster.close()
+    # Let the cancelled writer tasks finish
+    await asyncio.sleep(0)
+    return elapsed
+
+
+async def main(args):
+    print(f"players={args.players} rounds={args.rounds}")
+    print(f"{'viewers':>8} {'per-viewer us':>14} {'encode-once us':>15} {'speedup':>8}")
+    results = []
+    for viewers in args.viewers:
+        old = await bench(PerViewerEncodeBroadcaster, viewers, args.players, args.rounds)
+        new = await bench(server.Broadcaster, viewers, args.players, args.rounds)
+        results.append({
+            "viewers": viewers,
+            "players": args.players,
+            "per_viewer_encode_cpu_us": old * 1e6,
+            "encode_once_cpu_us": new * 1e6,
+        })
+        print(f"{viewers:>8} {old * 1e6:>14.1f} {new * 1e6:>15.1f} {old / new:>7.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--viewers", type=int, nargs="+", default=[1, 10, 100, 500, 1000])
+    parser.add_argument("--players", type=int, default=2, help="Players in the broadcast payload")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--json", help="Also write results to this file")
+    asyncio.run(main(parser.parse_args()))
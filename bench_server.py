@@ -0,0 +1,216 @@
+"""Load test for server.py.
+
+Starts the server locally, then simulates game stations pushing
+"room:player_id:score" messages over TCP and scoreboard viewers
+watching their room over WebSocket. Reports ingest throughput and the
+latency from a score being sent to a viewer receiving it.
+
+    python bench_server.py --stations 200 --viewers 400 --rate 5 --duration 20
+    python bench_server.py --workers 4 --output results.json
+
+Each station sends an increasing counter as its score, so a viewer can
+look up when the value it got was sent. Broadcast ticks coalesce
+updates, so only the values that reach viewers are measured. Viewers
+that fail to connect or drop out are counted, and fail the run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import websockets
+
+HOST = "127.0.0.1"
+TCP_PORT = 8080
+HTTP_PORT = 8000
+
+
+class Stats:
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.send_times = {}  # (room, player_id, score) -> time sent
+        self.latencies = []
+        self.viewer_errors = []
+
+    def percentile(self, p):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+async def station(stats, room, player_id, rate, stop_at):
+    reader, writer = await asyncio.open_connection(HOST, TCP_PORT)
+    interval = 1 / rate
+    score = 0
+    next_send = time.perf_counter()
+    try:
+        while time.perf_counter() < stop_at:
+            score += 1
+            stats.send_times[(room, player_id, str(score))] = time.perf_counter()
+            writer.write(f"{room}:{player_id}:{score}\n".encode())
+            await writer.drain()
+            stats.sent += 1
+
+            next_send += interval
+            await asyncio.sleep(max(0, next_send - time.perf_counter()))
+    finally:
+        writer.close()
+
+
+async def create_rooms(rooms):
+    # Rooms only exist once a score arrived, viewers of any other room are refused
+    reader, writer = await asyncio.open_connection(HOST, TCP_PORT)
+    for room in rooms:
+        writer.write(f"{room}:player_1:0\n".encode())
+    await writer.drain()
+    writer.close()
+
+
+async def connect_viewer(room, deadline):
+    # Retries like the scoreboard page until the room's first score landed
+    while True:
+        try:
+            return await websockets.connect(f"ws://{HOST}:{HTTP_PORT}/ws?room={room}", max_queue=None)
+        except (OSError, websockets.exceptions.InvalidHandshake):
+            if time.perf_counter() >= deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def viewer(stats, room, stop_at):
+    ws = await connect_viewer(room, time.perf_counter() + 5)
+    async with ws:
+        while True:
+            remaining = stop_at - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(ws.recv(), remaining)
+            except asyncio.TimeoutError:
+                break
+            now = time.perf_counter()
+            try:
+                scores = json.loads(message)
+            except ValueError:
+                continue
+            for player_id, score in scores.items():
+                sent_at = stats.send_times.get((room, player_id, score))
+                if sent_at is not None:
+                    stats.latencies.append(now - sent_at)
+                    stats.received += 1
+
+
+def wait_for_port(port, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not open port {port}")
+
+
+async def run_load(args):
+    stats = Stats()
+    rooms = [f"bench-{i}" for i in range((args.stations + 1) // 2)]
+
+    # Viewers connect first and get their initial snapshot before load starts
+    await create_rooms(rooms)
+    stop_at = time.perf_counter() + args.duration + 2
+    viewers = [
+        asyncio.create_task(viewer(stats, rooms[i % len(rooms)], stop_at))
+        for i in range(args.viewers)
+    ]
+    await asyncio.sleep(1)
+
+    start = time.perf_counter()
+    load_stop = start + args.duration
+    stations = [
+        asyncio.create_task(station(stats, rooms[i // 2], f"player_{i % 2 + 1}", args.rate, load_stop))
+        for i in range(args.stations)
+    ]
+    await asyncio.gather(*stations)
+    elapsed = time.perf_counter() - start
+    for result in await asyncio.gather(*viewers, return_exceptions=True):
+        if isinstance(result, Exception):
+            stats.viewer_errors.append(repr(result))
+    return stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=50, help="Simulated game clients")
+    parser.add_argument("--viewers", type=int, default=100, help="Simulated scoreboard browsers")
+    parser.add_argument("--rate", type=float, default=5, help="Messages per second per station")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes")
+    parser.add_argument("--tick", type=float, help="BROADCAST_TICK for the server")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    log_dir = tempfile.mkdtemp(prefix="space-event-bench-")
+    env["SCORE_LOG_DIR"] = log_dir
+    if args.tick is not None:
+        env["BROADCAST_TICK"] = str(args.tick)
+
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+    server = subprocess.Popen(
+        [sys.executable, server_path, "--workers", str(args.workers)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(HTTP_PORT)
+        wait_for_port(TCP_PORT)
+        stats, elapsed = asyncio.run(run_load(args))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    results = {
+        "stations": args.stations,
+        "viewers": args.viewers,
+        "rate": args.rate,
+        "workers": args.workers,
+        "duration": elapsed,
+        "messages_sent": stats.sent,
+        "ingest_per_second": stats.sent / elapsed,
+        "updates_received": stats.received,
+        "viewers_failed": len(stats.viewer_errors),
+        "latency_p50_ms": None if not stats.latencies else stats.percentile(50) * 1000,
+        "latency_p99_ms": None if not stats.latencies else stats.percentile(99) * 1000,
+        "latency_max_ms": None if not stats.latencies else max(stats.latencies) * 1000,
+    }
+
+    print(f"stations={args.stations} viewers={args.viewers} rate={args.rate}/s workers={args.workers}")
+    print(f"ingest: {stats.sent} messages in {elapsed:.1f}s ({results['ingest_per_second']:.0f}/s)")
+    if stats.latencies:
+        print(f"ingest to viewer latency: p50 {results['latency_p50_ms']:.1f} ms, "
+              f"p99 {results['latency_p99_ms']:.1f} ms, max {results['latency_max_ms']:.1f} ms "
+              f"over {stats.received} updates")
+    else:
+        print("no updates reached the viewers")
+    if stats.viewer_errors:
+        print(f"{len(stats.viewer_errors)} of {args.viewers} viewers failed, first error: {stats.viewer_errors[0]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if stats.viewer_errors or (args.viewers and not stats.latencies):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Fixed size pools of game entities that are recycled instead of destroyed."""
+from collections import deque
+
+
+class EntityPool:
+    """A fixed number of entities, made once up front and then reused.
+
+    acquire() enables a free entity and returns it, release() disables it
+    again. Disabled entities are not drawn and don't collide, so a
+    released one costs nothing per frame. When every entity is in use the
+    oldest active one is recycled, the pool never grows.
+    """
+
+    def __init__(self, factory, capacity):
+        self.free = deque()
+        self.active = []
+        for _ in range(capacity):
+            entity = factory()
+            entity.enabled = False
+            self.free.append(entity)
+
+    def __iter__(self):
+        # A copy, so entities can be released while iterating
+        return iter(list(self.active))
+
+    def __len__(self):
+        return len(self.active)
+
+    def acquire(self):
+        if self.free:
+            entity = self.free.popleft()
+        else:
+            entity = self.active.pop(0)
+        entity.enabled = True
+        self.active.append(entity)
+        return entity
+
+    def release(self, entity):
+        entity.enabled = False
+        self.active.remove(entity)
+        self.free.append(entity)
+
+    def release_all(self):
+        for entity in self.active:
+            entity.enabled = False
+            self.free.append(entity)
+        self.active.clear()
@@ -10,32 +10,61 @@ from ursina import *
 from random import randint, choice, sample
 import time
 import cv2
-import mediapipe as mp
-import numpy as np
 from threading import Thread
 import threading
 from PIL import Image
+from panda3d.core import Texture as PandaTexture
 import io
 from multiprocessing import Process, Value
 import ctypes
-import socket
 import websockets
-import json
 import asyncio
 from websockets.exceptions import WebSocketException
+from score_uplink import ScoreUplink
+from gesture_pipeline import CAMERA_FAILED, CAMERA_READY, CAMERA_STAGES, CAMERA_STARTING, run_camera
+from shared_frame import SharedFrame
+from gesture_events import GestureEventRing, LANE, PINCH_START, RESTART
+from stage_timings import StageTimings
+from entity_pool import EntityPool
+from lane_collisions import LaneCollisions
+from sound_bank import SoundBank
+from hud import HudCounter
+from simulation import FixedTimestep, interpolate, move, place
 
 # Set environment variable to skip camera authorization request
 os.environ["OPENCV_AVFOUNDATION_SKIP_AUTH"] = "1"
 
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(min_detection_confidence=0.7, min_tracking_confidence=0.5)
-mp_draw = mp.solutions.drawing_utils
-
 # Add these global variables near the start
 running = True
 cap = None
 player_id = "player_2"  # This file will be for player 1
 ws_client = None
+uplink = None
+
+# Score server (ngrok tcp tunnel forwarding to port 8080 on the server)
+SCORE_HOST = '0.tcp.in.ngrok.io'
+SCORE_PORT = 11282
+ROOM = "default"  # Both cabinets of a match use the same room
+
+# Only run hand landmarking on a crop around the pose wrists, with a full
+# frame search when the hand is lost. Set to False to always search the
+# full frame.
+HAND_ROI = True
+
+# The annotated camera frame is shown in the game through shared memory.
+# The separate OpenCV window is only for debugging.
+PREVIEW_SIZE = (400, 300)
+PREVIEW_FPS = 15
+SHOW_CV_WINDOW = False
+
+# Gesture updates per second. The camera loop sleeps only what's left of
+# each frame, and runs as fast as it can when the machine is slower.
+CONTROL_RATE = 30
+
+# The camera loop times its stages. F3 toggles an overlay with their
+# rolling p50/p99, F4 writes the full histograms to TIMINGS_FILE.
+SHOW_TIMINGS = False
+TIMINGS_FILE = f"camera_timings_{player_id}.json"
 
 # MacOS-specific camera permission handling
 def check_camera_permission():
@@ -51,149 +80,73 @@ def check_camera_permission():
         print(f"Error checking camera permission: {e}")
         return False
 
-# Initialize MediaPipe with error handling
-def init_mediapipe():
-    try:
-        mp_hands = mp.solutions.hands
-        hands = mp_hands.Hands(
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        return mp_hands, hands
-    except Exception as e:
-        print(f"Error initializing MediaPipe: {e}")
-        return None, None
-
-# Global variables
-running = True
-mp_hands, hands = init_mediapipe()
-mp_draw = mp.solutions.drawing_utils
-
 class CameraPreview(Entity):
-    def __init__(self):
+    def __init__(self, shared_frame, max_fps=PREVIEW_FPS):
         super().__init__()
         self.parent = camera.ui
         self.model = 'quad'
-        self.texture = None
         self.scale = (0.3, 0.2)
         self.position = Vec2(0.7, 0.3)
         self.always_on_top = True
 
+        # OpenCV frames are BGR, which is Panda's native order for F_rgb
+        height, width, _ = shared_frame.shape
+        self.frame_texture = PandaTexture('camera_preview')
+        self.frame_texture.setup2dTexture(width, height, PandaTexture.T_unsigned_byte, PandaTexture.F_rgb)
+        self.texture = Texture(self.frame_texture)
+
+        self.shared_frame = shared_frame
+        self.last_seq = 0
+        self.interval = 1 / max_fps
+        self.next_upload = 0
+
+    def update(self):
+        now = time.time()
+        if now < self.next_upload:
+            return
+
+        seq, pixels = self.shared_frame.begin_read()
+        if seq is None or seq == self.last_seq:
+            return
+        # Upload straight from shared memory, retry next frame if it was torn
+        with pixels:
+            self.frame_texture.setRamImage(pixels)
+        if self.shared_frame.end_read(seq):
+            self.last_seq = seq
+            self.next_upload = now + self.interval
+
 class GestureController:
+    """Runs gesture_pipeline.run_camera in its own process.
+
+    Owns the shared memory the camera process writes to: the status,
+    the gesture events, the stage timings and the preview frame.
+    """
+
     def __init__(self):
         self.running = Value(ctypes.c_bool, True)
-        self.movement = Value(ctypes.c_int, 0)  # -1 for left, 0 for neutral, 1 for right
-        self.shoot = Value(ctypes.c_bool, False)
-        self.restart = Value(ctypes.c_bool, False)
-        self.last_shoot = False
+        self.status = Value(ctypes.c_int, CAMERA_STARTING, lock=False)  # Read every frame
+        self.skipped = Value(ctypes.c_long, 0, lock=False)  # Control ticks the camera loop missed
+        # Lane, pinch and restart events, drained by the game every frame
+        self.events = GestureEventRing.create()
+        self.timings = StageTimings.create(CAMERA_STAGES)
         self.process = None
+        width, height = PREVIEW_SIZE
+        self.preview = SharedFrame.create((height, width, 3))
 
-    def camera_process(self, running, movement, shoot, restart):
-        try:
-            cap = cv2.VideoCapture(0)
-            if not cap.isOpened():
-                print("Failed to open camera")
-                return
-
-            while running.value:
-                success, image = cap.read()
-                if not success:
-                    continue
-
-                image = cv2.resize(image, (400, 300))
-                image = cv2.flip(image, 1)
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                
-                # Process pose landmarks
-                pose_results = pose.process(image_rgb)
-
-                # Process hand landmarks for shooting
-                hand_results = hands.process(image_rgb)
-
-                h, w, _ = image.shape
-                left_boundary = w * 0.35
-                right_boundary = w * 0.65
-
-                cv2.line(image, (int(left_boundary), 0), (int(left_boundary), h), (255, 0, 0), 2)
-                cv2.line(image, (int(right_boundary), 0), (int(right_boundary), h), (255, 0, 0), 2)
-
-                # Shoulder-based movement detection
-                if pose_results.pose_landmarks:
-                    landmarks = pose_results.pose_landmarks.landmark
-                    left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-                    right_shoulder = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER]
-                    
-                    # Calculate the midpoint of the shoulders
-                    shoulder_midpoint = (left_shoulder.x + right_shoulder.x) / 2
-                    mid_x = int((left_shoulder.x + right_shoulder.x) * image.shape[1] / 2)
-                    mid_y = int((left_shoulder.y + right_shoulder.y) * image.shape[0] / 2)
-
-                     # Draw a plus sign at the midpoint
-                    line_length = 10  
-                    color = (0, 255, 0) 
-                    thickness = 2  
-
-                    # Horizontal line of the plus sign
-                    cv2.line(image, (mid_x - line_length, mid_y), (mid_x + line_length, mid_y), color, thickness)
-                    # Vertical line of the plus sign
-                    cv2.line(image, (mid_x, mid_y - line_length), (mid_x, mid_y + line_length), color, thickness)
-
-                    if shoulder_midpoint < 0.35:  # Left zone
-                        movement.value = -1
-                    elif shoulder_midpoint > 0.65:  # Right zone
-                        movement.value = 1
-                    else:  # Center zone
-                        movement.value = 0
-
-                # Hand gesture shooting
-                if hand_results.multi_hand_landmarks:
-                    hand_landmarks = hand_results.multi_hand_landmarks[0]
-                    mp_draw.draw_landmarks(
-                        image,
-                        hand_landmarks,
-                        mp_hands.HAND_CONNECTIONS
-                    )
-
-                    # Shooting gesture (pinch detection)
-                    thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-                    index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-
-                    pinch_distance = np.sqrt(
-                        (thumb_tip.x - index_tip.x)**2 +
-                        (thumb_tip.y - index_tip.y)**2
-                    )
-                    shoot.value = pinch_distance < 0.1  # Set shoot value based on pinch distance
-
-                # Visual feedback
-                position_text = "LEFT" if movement.value == -1 else "RIGHT" if movement.value == 1 else "CENTER"
-                cv2.putText(image, f"Position: {position_text}", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-                cv2.putText(image, f"Shoot: {shoot.value}", (10, 60),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-
-                cv2.imshow('Shoulder Controls', image)
-                if cv2.waitKey(1) & 0xFF == 27:
-                    running.value = False
-
-                time.sleep(0.016)
-
-        except Exception as e:
-            print(f"Camera process error: {e}")
-        finally:
-            if cap is not None:
-                cap.release()
-            cv2.destroyAllWindows()
-    
     def start(self):
-        self.process = Process(target=self.camera_process, 
-                             args=(self.running, self.movement, self.shoot, self.restart))
+        # Only settings go to the process, never this game module's state
+        self.process = Process(target=run_camera,
+                               args=(self.running, self.status, self.skipped, self.events.name, self.preview.name, self.timings.name,
+                                     PREVIEW_SIZE, HAND_ROI, CONTROL_RATE, SHOW_CV_WINDOW))
         self.process.start()
 
     def stop(self):
         self.running.value = False
         if self.process:
             self.process.join()
+        self.preview.close()
+        self.events.close()
+        self.timings.close()
 
 class WebSocketClient:
     def __init__(self):
@@ -234,21 +187,19 @@ def restart_game():
     game_over = False
     score = 0
     bullet_count = max_bullets
-    current_lane = 1
+    current_lane = gesture_lane + 1  # Wherever the player stands now
     
     # Reset player position
     player.x = lanes[current_lane]
     
-    # Clear existing entities
-    for bullet in bullets:
-        destroy(bullet)
+    # Clear existing entities, bullets go back to their pool
+    bullets.release_all()
     for invader in invaders:
         destroy(invader)
     for ammo_item in ammo:
         destroy(ammo_item)
     
     # Clear lists
-    bullets.clear()
     invaders.clear()
     ammo.clear()
     
@@ -263,146 +214,200 @@ def restart_game():
         ammo.append(ammo_item)
     
     # Reset score and ammo display
-    score_text.text = 'Score: 0'
-    ammo_text.text = f"Ammo: {bullet_count}"
-    
-    # Find and destroy all game over related text entities
-    entities_to_destroy = []
-    for entity in scene.entities:
-        if isinstance(entity, Text):
-            if entity != score_text and entity != ammo_text:  # Don't destroy score and ammo text
-                entities_to_destroy.append(entity)
+    score_hud.set(score)
+    ammo_hud.set(bullet_count)
     
-    # Destroy the collected entities
-    for entity in entities_to_destroy:
+    # Destroy the game over text
+    for entity in game_over_texts:
         destroy(entity)
+    game_over_texts.clear()
+
+def update_camera_status():
+    """Shows the camera status until it's ready, returns the status."""
+    global camera_status
+    status = controller.status.value
+    if status != camera_status:
+        camera_status = status
+        if status == CAMERA_READY:
+            camera_text.enabled = False
+        elif status == CAMERA_FAILED:
+            camera_text.text = 'Camera unavailable, use the arrow keys'
+            camera_text.color = color.red
+    return status
+
+def update_timings_overlay():
+    """Refreshes the camera timings overlay twice a second while it's shown."""
+    global timings_baseline
+    now = time.time()
+    if not timings_text.enabled or (timings_baseline is not None and now - timings_baseline[0] < 0.5):
+        return
 
-def update():
-    global invaders, bullets, score, last_time, game_over, locked_lane, max_bullets, bullet_count, controller, current_lane
-
-    # Check for restart gesture
-    if controller.restart.value and game_over:
-        restart_game()
+    stats = controller.timings.snapshot()
+    if stats is None or not stats["stages"]:
         return
+    # Effective control rate and skipped ticks since the last refresh. The
+    # first refresh after the overlay is shown only sets the baseline.
+    skipped = controller.skipped.value
+    if timings_baseline is None:
+        header = f"camera -/{CONTROL_RATE} fps"
+    else:
+        refreshed_at, frames, skipped_before = timings_baseline
+        rate = (stats["frames"] - frames) / (now - refreshed_at)
+        skip_rate = (skipped - skipped_before) / (now - refreshed_at)
+        header = f"camera {rate:.1f}/{CONTROL_RATE} fps, {skip_rate:.1f}/s ticks skipped"
+    timings_baseline = (now, stats["frames"], skipped)
+    lines = [f"{header}, last {stats['window']} frames"]
+    for stage, timing in stats["stages"].items():
+        lines.append(f"{stage:<10} p50 {timing['p50_ms']:5.1f}  p99 {timing['p99_ms']:5.1f} ms")
+    timings_text.text = "\n".join(lines)
+
+def fire_bullet():
+    global bullet_count
+    if bullet_count > 0:
+        sounds.play('laser')
+        bullet = bullets.acquire()
+        bullet.position = player.position
+        place(bullet, player.sim_y + 0.2)
+        bullet_count -= 1
+
+def handle_gesture_events():
+    """Applies every gesture the camera process sent since the last frame."""
+    global current_lane, gesture_lane
+    for kind, value, timestamp in controller.events.drain():
+        if kind == LANE:
+            # Kept during the game over screen too, the camera only sends
+            # a lane when it changes and restart puts the ship there
+            gesture_lane = value
+        if kind == RESTART:
+            if game_over:
+                restart_game()
+        elif game_over:
+            continue  # Other gestures made during the game over screen are dropped
+        elif kind == LANE:
+            current_lane = value + 1  # -1, 0, 1 to lane index
+            player.x = lanes[current_lane]
+        elif kind == PINCH_START:
+            fire_bullet()
+
+def update():
+    # Gestures are events, so the arrow keys work as well
+    update_camera_status()
+    handle_gesture_events()
+    update_timings_overlay()
 
     if game_over:
         return
 
-    # Handle hand gesture controls
-    if controller.movement.value == -1:  # Left
-        current_lane = 0
-        player.x = lanes[current_lane]
-    elif controller.movement.value == 1:  # Right
-        current_lane = 2
-        player.x = lanes[current_lane]
-    else:  # Center
-        current_lane = 1
-        player.x = lanes[current_lane]
+    # Run the gameplay in fixed steps for the time this frame took, then
+    # draw everything between its last two simulated positions
+    alpha = sim.advance(time.dt, step)
+    interpolate(invaders, alpha)
+    interpolate(bullets, alpha)
+    interpolate(ammo, alpha)
 
-    # Handle shooting with cooldown
-    if controller.shoot.value and not controller.last_shoot and bullet_count > 0:
-        Audio('assets/laser_sound.wav')
-        bullet = Bullet()
-        bullets.append(bullet)
-        bullet_count -= 1
-    controller.last_shoot = controller.shoot.value
+    # Update ammo count display, only redrawn when it changed
+    ammo_hud.set(bullet_count)
 
-    # Update ammo count display
-    ammo_text.text = f"Ammo: {bullet_count}"
+def step(dt):
+    """Advances the gameplay by one fixed step of dt seconds."""
+    global score, bullet_count, next_score_tick
+
+    if game_over:
+        return
 
     # Update invaders
     for invader in invaders:
-        invader.y += time.dt * invader.dy
+        move(invader, invader.dy, dt)
 
-        if invader.intersects(player).hit:
+        if collisions.overlaps(invader, player):
             end_game()
             return
 
-        if invader.y <= -0.5:
+        if invader.sim_y <= -0.5:
             reset_invader(invader)
 
-    # Update bullets
+    # Update bullets, they go back to the pool when they hit or leave the field
+    collisions.update(invaders)
     for bullet in bullets:
-        bullet.y += time.dt * bullet.dy
-        hit_info = bullet.intersects()
-        if hit_info.hit:
-            Audio('assets/medium-explosion-40472.mp3')
-            bullet.x = 10
+        move(bullet, bullet.dy, dt)
+        if bullet.sim_y > BULLET_MAX_Y:
+            bullets.release(bullet)
+            continue
+
+        invader = collisions.hit(bullet)
+        if invader is not None:
+            sounds.play('explosion')
+            bullets.release(bullet)
             score += 10
-            score_text.text = f"Score: {score}"
+            score_hud.set(score)
 
-            if hit_info.entity in invaders:
-                reset_invader(hit_info.entity)
+            reset_invader(invader)
+            collisions.discard(invader)  # It moved, no other bullet can hit it this step
 
     # Check ammo collection
     for ammo_item in ammo:
-        if not getattr(ammo_item, 'collected', False):
-            ammo_item.y -= time.dt * ammo_item.dy
-            if ammo_item.y <= -0.5:
+        if ammo_item.collected:
+            if sim.time >= ammo_item.respawn_at:
                 reset_ammo(ammo_item)
+            continue
+
+        move(ammo_item, -ammo_item.dy, dt)
+        if ammo_item.sim_y <= -0.5:
+            reset_ammo(ammo_item)
 
-            if player.intersects(ammo_item).hit:
-                ammo_item.collected = True
-                ammo_item.y = -1
-                bullet_count += 3
-                bullet_count = min(bullet_count, max_bullets)
-                invoke(reset_ammo, ammo_item, delay=0.5)
+        if collisions.overlaps(player, ammo_item):
+            ammo_item.collected = True
+            ammo_item.respawn_at = sim.time + 0.5
+            place(ammo_item, -1)
+            bullet_count += 3
+            bullet_count = min(bullet_count, max_bullets)
 
-    # Increment score
-    current_time = time.time()
-    if current_time - last_time >= 1:
+    # Increment score every simulated second
+    if sim.time >= next_score_tick:
         score += 12
-        score_text.text = f"Score: {score}"
-        last_time = current_time
+        score_hud.set(score)
+        next_score_tick += 1
         
-        # Send score update to server
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            host = '0.tcp.in.ngrok.io'
-            port = 11282
-            sock.connect((host, port))
-            score_data = f"{player_id}:{score}"
-            sock.send(bytes(score_data, 'utf-8'))
-            sock.close()
-        except Exception as e:
-            print(f"Error sending score: {e}")
+        # Send score update to server (queued, never blocks the frame)
+        uplink.send(f"{ROOM}:{player_id}:{score}")
 
 def main():
-    global controller, ws_client
-    
-    # Initialize score file
-    with open(f'scores_{player_id}.txt', 'w') as f:
-        f.write('0')
-    
-    # Initialize controller and WebSocket client
-    controller = GestureController()
-    controller.start()
+    global ws_client, uplink
+
+    # The controller was started before the window was created
+    CameraPreview(controller.preview)
     
     ws_client = WebSocketClient()
     ws_client.start()
+
+    uplink = ScoreUplink(SCORE_HOST, SCORE_PORT)
+    uplink.start()
     
     try:
         app.run()
     except Exception as e:
         print(f"Game error: {e}")
     finally:
+        uplink.stop()
         ws_client.stop()
         controller.stop()
 
-if __name__ == "__main__":
-    if check_camera_permission():
-        print(f"Game started as {player_id}")
-        main()
-    else:
-        print("Please grant camera permission and restart the application")
-
 def input(key):
-    global current_lane, bullet_count
+    global current_lane, bullet_count, timings_baseline
 
     if key == 'r' and game_over:  # Add restart on 'R' key press when game is over
         restart_game()
         return
 
+    if key == 'f3':
+        timings_text.enabled = not timings_text.enabled
+        timings_baseline = None  # Don't average the rate over the time it was hidden
+        return
+    if key == 'f4':
+        if controller.timings.dump(TIMINGS_FILE):
+            print(f"Camera timings written to {TIMINGS_FILE}")
+        return
+
     if game_over:
         return
 
@@ -414,11 +419,8 @@ def input(key):
         current_lane += 1
         player.x = lanes[current_lane]
 
-    elif key == "space" and bullet_count > 0:
-        Audio('assets/laser_sound.wav')
-        bullet = Bullet()
-        bullets.append(bullet)
-        bullet_count -= 1
+    elif key == "space":
+        fire_bullet()
 
 
 def reset_invader(invader):
@@ -431,16 +433,16 @@ def reset_invader(invader):
 
     selected_lanes = sample(available_lanes, 2)  # Randomly pick 2 out of the 3 lanes
     invader.x = choice(selected_lanes)  # Place invader in one of the selected lanes
-    invader.y = randint(80, 120) * 0.01
+    place(invader, randint(80, 120) * 0.01)
 
     locked_lane = list(set(lanes) - set(selected_lanes))[0]
-    locked_until[locked_lane] = time.time() + randint(3, 5)  # Lock the lane for 3-5 seconds
+    locked_until[locked_lane] = sim.time + randint(3, 5)  # Lock the lane for 3-5 seconds
 
 
 def reset_ammo(ammo_item):
     """Reset the position of an ammo item."""
     ammo_item.x = choice(lanes)  # Place ammo in a random lane
-    ammo_item.y = randint(80, 120) * 0.01  # Respawn at a random height
+    place(ammo_item, randint(80, 120) * 0.01)  # Respawn at a random height
     ammo_item.collected = False  # Mark as active again
 
 
@@ -450,26 +452,14 @@ def end_game():
     game_over = True
 
     # Display messages
-    Text(text='Game Over', origin=(0, 0), scale=3, color=color.red, position=(0, 0.1), background=True, font=custom_font)
-    Text(text=f'Final Score: {score}', origin=(0, 0), scale=2, color=color.yellow, position=(0, -0.1), background=True, font=custom_font)
-    Text(text='Press R to Restart', origin=(0, 0), scale=2, color=color.green, position=(0, -0.3), background=True, font=custom_font)
+    game_over_texts.extend([
+        Text(text='Game Over', origin=(0, 0), scale=3, color=color.red, position=(0, 0.1), background=True, font=custom_font),
+        Text(text=f'Final Score: {score}', origin=(0, 0), scale=2, color=color.yellow, position=(0, -0.1), background=True, font=custom_font),
+        Text(text='Press R to Restart', origin=(0, 0), scale=2, color=color.green, position=(0, -0.3), background=True, font=custom_font),
+    ])
 
-    # Update score files and send final score
-    try:
-        # Update local score file
-        with open(f'scores_{player_id}.txt', 'w') as f:
-            f.write(str(score))
-            
-        # Send final score to server
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        host = '0.tcp.in.ngrok.io'  # Update with your ngrok URL
-        port = 11282
-        sock.connect((host, port))
-        score_data = f"{player_id}:{score}"
-        sock.send(bytes(score_data, 'utf-8'))
-        sock.close()
-    except Exception as e:
-        print(f"Error updating final score: {e}")
+    # Send final score to server, which keeps it in its score log and leaderboard
+    uplink.send(f"{ROOM}:{player_id}:{score}:final")
 
 
 class Invader(Entity):
@@ -481,7 +471,9 @@ class Invader(Entity):
         self.scale = 0.1
         self.position = (choice(lanes), randint(80, 120) * 0.01, -0.1)
         self.collider = 'box'
+        self.half_height = 0.05  # For LaneCollisions
         self.dy = -0.15
+        place(self, self.y)
 
 
 class Player(Entity):
@@ -493,6 +485,8 @@ class Player(Entity):
         self.scale = (0.2, 0.2, 0)
         self.position = (0, -0.5, -0.1)
         self.collider = BoxCollider(self, size=(0.15, 0.18, 0))
+        self.half_height = 0.18 * 0.2 / 2  # Collider height times scale
+        place(self, self.y)
 
 
 class Bullet(Entity):
@@ -506,7 +500,9 @@ class Bullet(Entity):
         self.position = player.position
         self.y = player.y + 0.2
         self.collider = 'box'
+        self.half_height = 0.05
         self.dy = 0.8
+        place(self, self.y)
 
 
 class Ammo(Entity):
@@ -518,58 +514,94 @@ class Ammo(Entity):
         self.scale = (0.05, 0.05, 0)
         self.position = (choice(lanes), randint(80, 120) * 0.01, -0.1)
         self.collider = 'box'
+        self.half_height = 0.025
         self.dy = 0.15  # Speed at which the ammo moves downwards
+        self.collected = False
+        place(self, self.y)
 
 
-app = Ursina()
+if __name__ == "__main__":
+    if not check_camera_permission():
+        print("Please grant camera permission and restart the application")
+        sys.exit(1)
 
-custom_font = 'assets/Jersey15-Regular.ttf'  # Path to the custom font file
+    # Start the camera process first, it opens the camera and loads its
+    # models while the window and the scene are set up. Everything below
+    # only runs in the game process: with spawn (the default on macOS)
+    # the camera process imports this file again as __mp_main__.
+    controller = GestureController()
+    controller.start()
 
-# Lane positions (left, middle, right)
-lanes = [-0.5, 0, 0.5]
-current_lane = 1  # Player starts in the middle lane
-max_bullets = 5  # Maximum number of bullets player can have at once
-bullet_count = max_bullets  # Player starts with a full clip
+    app = Ursina()
 
-field_size = 19
-Entity(model='quad', scale=60, texture='assets/dark_space_scene_variant')
-field = Entity(model='quad', color=color.rgba(255, 255, 255, 0), scale=(12, 18),
-               position=(field_size // 2, field_size // 2, -0.01))
+    custom_font = 'assets/Jersey15-Regular.ttf'  # Path to the custom font file
 
-bullets = []  # List to store bullets
-invaders = []  # List to store invaders
-ammo = []  # List to store ammo pickups
-locked_lane = None  # The currently locked lane
-locked_until = {lane: 0 for lane in lanes}  # Track when each lane is unlocked
+    # Sound effects are decoded here once, shots and hits reuse their voices
+    sounds = SoundBank()
+    sounds.load('laser', 'assets/laser_sound.wav', max_voices=4)
+    sounds.load('explosion', 'assets/medium-explosion-40472.mp3', max_voices=3)
 
-player = Player()
-player.x = lanes[current_lane]  # Position player in the middle
+    # Lane positions (left, middle, right)
+    lanes = [-0.5, 0, 0.5]
+    current_lane = 1  # Player starts in the middle lane
+    gesture_lane = 0  # Last lane (-1, 0, 1) the camera sent
+    max_bullets = 5  # Maximum number of bullets player can have at once
+    bullet_count = max_bullets  # Player starts with a full clip
 
-for i in range(5):  # Create 10 invaders
-    invader = Invader()
-    invaders.append(invader)
+    field_size = 19
+    Entity(model='quad', scale=60, texture='assets/dark_space_scene_variant')
+    field = Entity(model='quad', color=color.rgba(255, 255, 255, 0), scale=(12, 18),
+                   position=(field_size // 2, field_size // 2, -0.01))
 
-# Create ammo items randomly
-for i in range(3):
-    ammo_item = Ammo()
-    ammo.append(ammo_item)
+    invaders = []  # List to store invaders
+    ammo = []  # List to store ammo pickups
+    locked_lane = None  # The currently locked lane
+    locked_until = {lane: 0 for lane in lanes}  # Track when each lane is unlocked
+    collisions = LaneCollisions(lanes, y_attr='sim_y')  # Hits are only checked within a lane
 
-score = 0
-last_time = time.time()
-game_over = False
+    # Gameplay steps per second, independent of the frame rate
+    SIM_RATE = 120
+    sim = FixedTimestep(SIM_RATE)
 
-# Display score
-score_text = Text(text='Score: 0', position=(-0.65, 0.4), origin=(0, 0), scale=2, color=color.violet, background=True, font=custom_font)
+    player = Player()
+    player.x = lanes[current_lane]  # Position player in the middle
 
-# Display ammo count
-ammo_text = Text(text=f"Ammo: {bullet_count}", position=(0.65, 0.4), origin=(0, 0), scale=2, color=color.magenta, background=True, font=custom_font)
+    # Bullets are made once and recycled. Past BULLET_MAX_Y (above where
+    # invaders spawn) a bullet can't hit anything anymore.
+    BULLET_POOL_SIZE = 16
+    BULLET_MAX_Y = 1.3
+    bullets = EntityPool(Bullet, BULLET_POOL_SIZE)
 
-camera.position = (field_size // 2, -18, -18)
-camera.rotation_x = -56
+    for i in range(5):  # Create 10 invaders
+        invader = Invader()
+        invaders.append(invader)
 
-if __name__ == "__main__":
-    if check_camera_permission():
-        print(f"Game started as {player_id}")
-        main()
-    else:
-        print("Please grant camera permission and restart the application")
\ No newline at end of file
+    # Create ammo items randomly
+    for i in range(3):
+        ammo_item = Ammo()
+        ammo.append(ammo_item)
+
+    score = 0
+    next_score_tick = 1.0  # In simulated seconds
+    game_over = False
+    game_over_texts = []  # Destroyed on restart
+
+    # Display score
+    score_hud = HudCounter('Score: ', score, max_digits=6, position=(-0.65, 0.4), scale=2, text_color=color.violet, font=custom_font)
+
+    # Display ammo count
+    ammo_hud = HudCounter('Ammo: ', bullet_count, max_digits=2, position=(0.65, 0.4), scale=2, text_color=color.magenta, font=custom_font)
+
+    # Shown until the camera process is ready
+    camera_status = CAMERA_STARTING
+    camera_text = Text(text='Starting camera...', position=(0, -0.4), origin=(0, 0), scale=1.5, color=color.azure, background=True, font=custom_font)
+
+    # Camera stage timings, toggled with F3
+    timings_text = Text(text='', position=(-0.85, 0.3), origin=(-0.5, 0.5), scale=0.8, color=color.white, background=True, enabled=SHOW_TIMINGS)
+    timings_baseline = None  # (time, frames, skipped) at the last refresh
+
+    camera.position = (field_size // 2, -18, -18)
+    camera.rotation_x = -56
+
+    print(f"Game started as {player_id}")
+    main()
\ No newline at end of file
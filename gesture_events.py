@@ -0,0 +1,145 @@
+"""Gesture events from the camera process to the game, through shared memory.
+
+The camera process pushes timestamped events (lane changes, pinch start
+and end, restart) into a ring buffer in shared memory and the game drains
+everything that is pending once per frame. Unlike polling a shared value,
+a pinch that starts and ends between two game frames still arrives as
+two events, so no shot is lost whatever the frame rates are.
+
+There is exactly one producer and one consumer. The producer only
+writes the written counter and the consumer only writes the read
+counter, and a slot is filled before the written counter moves past it,
+so neither side needs a lock.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Event kinds
+LANE = 1  # value is the lane, -1 left, 0 center, 1 right
+PINCH_START = 2
+PINCH_END = 3
+RESTART = 4
+
+EVENT_DTYPE = np.dtype([("timestamp", "<f8"), ("kind", "<i4"), ("value", "<i4")])
+# Written and dropped counters, then the read counter on its own cache line
+READ_OFFSET = 64
+HEADER_SIZE = 128
+
+
+class GestureEventRing:
+    def __init__(self, shm, capacity, owner):
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        self.produced = np.ndarray((2,), dtype=np.uint64, buffer=shm.buf)  # written, dropped
+        self.consumed = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=READ_OFFSET)
+        self.slots = np.ndarray((capacity,), dtype=EVENT_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)
+
+    @classmethod
+    def create(cls, capacity=256):
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * EVENT_DTYPE.itemsize)
+        ring = cls(shm, capacity, owner=True)
+        ring.produced[:] = 0
+        ring.consumed[0] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name, capacity=256):
+        # Same as SharedFrame.attach, for child processes of the creator
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, capacity, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def dropped(self):
+        return int(self.produced[1])
+
+    def push(self, kind, value=0, timestamp=0.0):
+        """Producer side. Returns False if the ring was full and the event was dropped."""
+        written = int(self.produced[0])
+        if written - int(self.consumed[0]) >= self.capacity:
+            self.produced[1] += 1
+            return False
+        self.slots[written % self.capacity] = (timestamp, kind, value)
+        self.produced[0] = written + 1  # Publish only once the slot is filled
+        return True
+
+    def drain(self):
+        """Consumer side. Returns the pending (kind, value, timestamp) events, oldest first."""
+        read = int(self.consumed[0])
+        written = int(self.produced[0])
+        if read == written:
+            return []
+
+        events = self.slots[np.arange(read, written) % self.capacity]  # A copy
+        self.consumed[0] = written
+        return list(zip(events["kind"].tolist(), events["value"].tolist(), events["timestamp"].tolist()))
+
+    def close(self):
+        self.produced = None
+        self.consumed = None
+        self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class GestureDebouncer:
+    """Turns per frame readings into events, pushed only when they change.
+
+    A new lane has to hold for lane_frames frames before it is sent, so a
+    shoulder hovering on a zone boundary doesn't make the ship jitter. The
+    pinch has hysteresis, it starts below pinch_on and ends above
+    pinch_off. Losing the hand only ends it after hand_lost_frames frames
+    in a row without one, so a held pinch survives the frames where the
+    hand tracker misses it (it searches the full frame only every 5th
+    frame while the hand is lost).
+    """
+
+    def __init__(self, ring, lane_frames=2, pinch_on=0.1, pinch_off=0.13, hand_lost_frames=6):
+        self.ring = ring
+        self.lane_frames = lane_frames
+        self.pinch_on = pinch_on
+        self.pinch_off = pinch_off
+        self.hand_lost_frames = hand_lost_frames
+
+        self.lane = 0
+        self.pinching = False
+        self.candidate = 0
+        self.candidate_frames = 0
+        self.frames_without_hand = 0
+
+    def update_lane(self, lane, timestamp):
+        if lane == self.lane:
+            self.candidate_frames = 0
+            return
+        if lane != self.candidate:
+            self.candidate = lane
+            self.candidate_frames = 0
+        self.candidate_frames += 1
+        if self.candidate_frames >= self.lane_frames:
+            self.lane = lane
+            self.candidate_frames = 0
+            self.ring.push(LANE, lane, timestamp)
+
+    def update_pinch(self, distance, timestamp):
+        """distance between thumb and index tip, None when there is no hand."""
+        if distance is None:
+            self.frames_without_hand += 1
+            if self.pinching and self.frames_without_hand >= self.hand_lost_frames:
+                self.pinching = False
+                self.ring.push(PINCH_END, 0, timestamp)
+            return
+        self.frames_without_hand = 0
+
+        if self.pinching:
+            if distance > self.pinch_off:
+                self.pinching = False
+                self.ring.push(PINCH_END, 0, timestamp)
+        elif distance < self.pinch_on:
+            self.pinching = True
+            self.ring.push(PINCH_START, 0, timestamp)
@@ -0,0 +1,470 @@
+"""Helpers for the camera process of the shoulder controlled games.
+
+The camera process itself is run_camera(). It lives here and not in the
+game scripts, so a spawned process (the default on macOS) only imports
+this module and never sets up the game. mediapipe is only imported once
+the models are loaded, the game process never loads it.
+"""
+import threading
+import time
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from gesture_events import GestureDebouncer, GestureEventRing
+from shared_frame import SharedFrame
+from stage_timings import StageTimings
+
+# Shoulder midpoint zones, as a fraction of the frame width
+LEFT_ZONE = 0.35
+RIGHT_ZONE = 0.65
+
+# mediapipe landmark indices, so they can be used without importing it
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12  # PoseLandmark
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+THUMB_TIP, INDEX_FINGER_TIP = 4, 8  # HandLandmark
+
+# Pose landmarks (elbow, wrist) of each arm, left then right
+ARMS = ((LEFT_ELBOW, LEFT_WRIST), (RIGHT_ELBOW, RIGHT_WRIST))
+
+# Camera process status, so the game knows when gestures work
+CAMERA_STARTING = 0
+CAMERA_READY = 1
+CAMERA_FAILED = 2
+
+# Stages of the camera loop that run_camera() times
+CAMERA_STAGES = ("pace", "capture", "preprocess", "pose", "hands", "annotate", "display", "total")
+
+
+def load_models(hand_roi=True):
+    """Builds the pose and hand models, returns (pose, hands, hand_tracker).
+
+    Call it in the process that runs inference, loading the models
+    anywhere else only costs startup time and memory. hand_tracker is
+    None without hand_roi, then hands searches the full frame.
+    """
+    import mediapipe as mp
+    mp_pose = mp.solutions.pose
+    mp_hands = mp.solutions.hands
+
+    pose = mp_pose.Pose(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    hands = mp_hands.Hands(
+        max_num_hands=2,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+    hand_tracker = None
+    if hand_roi:
+        roi_hands = mp_hands.Hands(
+            max_num_hands=1,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+        hand_tracker = HandRoiTracker(hands, roi_hands)
+    return pose, hands, hand_tracker
+
+
+class GesturePipeline:
+    """The detection path of one frame, from the camera image to a decision.
+
+    process() resizes and mirrors the frame, runs pose and hand
+    landmarking and returns the lane the shoulders are in and the pinch
+    distance. The camera process and replay_gestures.py both run it, so a
+    recording exercises exactly what the game does. The time each stage
+    took on the last frame is kept in timings.
+    """
+
+    STAGES = ("preprocess", "pose", "hands", "annotate")
+
+    def __init__(self, frame_size=(400, 300), hand_roi=True, annotate=True):
+        self.frame_size = frame_size
+        self.annotate = annotate
+        self.pose, self.hands, self.hand_tracker = load_models(hand_roi)
+        self.timings = dict.fromkeys(self.STAGES, 0.0)
+
+        import mediapipe as mp
+        self.draw_landmarks = mp.solutions.drawing_utils.draw_landmarks
+        self.hand_connections = mp.solutions.hands.HAND_CONNECTIONS
+
+    def process(self, frame):
+        """Returns (image, lane, pinch_distance).
+
+        image is the resized, mirrored BGR frame, drawn on when annotate
+        is set. lane is -1, 0 or 1, or None without a pose. pinch_distance
+        is None without a hand.
+        """
+        start = perf_counter()
+        image = cv2.resize(frame, self.frame_size)
+        image = cv2.flip(image, 1)
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        preprocessed = perf_counter()
+
+        pose_landmarks = self.pose.process(image_rgb).pose_landmarks
+        posed = perf_counter()
+
+        if self.hand_tracker is not None:
+            hand_landmarks = self.hand_tracker.process(image_rgb, pose_landmarks)
+        else:
+            hand_results = self.hands.process(image_rgb)
+            hand_landmarks = hand_results.multi_hand_landmarks[0] if hand_results.multi_hand_landmarks else None
+        handed = perf_counter()
+
+        lane = None
+        if pose_landmarks is not None:
+            landmarks = pose_landmarks.landmark
+            shoulder_midpoint = (landmarks[LEFT_SHOULDER].x + landmarks[RIGHT_SHOULDER].x) / 2
+            if shoulder_midpoint < LEFT_ZONE:
+                lane = -1
+            elif shoulder_midpoint > RIGHT_ZONE:
+                lane = 1
+            else:
+                lane = 0
+
+        pinch_distance = None
+        if hand_landmarks is not None:
+            thumb_tip = hand_landmarks.landmark[THUMB_TIP]
+            index_tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
+            pinch_distance = ((thumb_tip.x - index_tip.x) ** 2 + (thumb_tip.y - index_tip.y) ** 2) ** 0.5
+
+        if self.annotate:
+            self.draw(image, pose_landmarks, hand_landmarks)
+        done = perf_counter()
+
+        timings = self.timings
+        timings["preprocess"] = preprocessed - start
+        timings["pose"] = posed - preprocessed
+        timings["hands"] = handed - posed
+        timings["annotate"] = done - handed
+        return image, lane, pinch_distance
+
+    def draw(self, image, pose_landmarks, hand_landmarks):
+        h, w, _ = image.shape
+        cv2.line(image, (int(w * LEFT_ZONE), 0), (int(w * LEFT_ZONE), h), (255, 0, 0), 2)
+        cv2.line(image, (int(w * RIGHT_ZONE), 0), (int(w * RIGHT_ZONE), h), (255, 0, 0), 2)
+
+        if pose_landmarks is not None:
+            # Plus sign at the shoulder midpoint
+            landmarks = pose_landmarks.landmark
+            left_shoulder = landmarks[LEFT_SHOULDER]
+            right_shoulder = landmarks[RIGHT_SHOULDER]
+            mid_x = int((left_shoulder.x + right_shoulder.x) * w / 2)
+            mid_y = int((left_shoulder.y + right_shoulder.y) * h / 2)
+            cv2.line(image, (mid_x - 10, mid_y), (mid_x + 10, mid_y), (0, 255, 0), 2)
+            cv2.line(image, (mid_x, mid_y - 10), (mid_x, mid_y + 10), (0, 255, 0), 2)
+
+        if self.hand_tracker is not None:
+            self.hand_tracker.draw_roi(image)
+        if hand_landmarks is not None:
+            self.draw_landmarks(image, hand_landmarks, self.hand_connections)
+
+
+class HandRoiTracker:
+    """Finds a hand by running hand landmarking on a crop around a wrist.
+
+    The pose result already tells us where the wrists are, so instead of
+    searching the whole frame we crop a box around the wrist (pushed a
+    little along the forearm, where the hand is) and run the hand model
+    on that. Only one crop is searched per frame. When the wrists
+    aren't visible or no hand was found in the crops for lost_after
+    frames we fall back to searching the full frame.
+
+    Landmarks are returned in full frame coordinates, so drawing and the
+    pinch threshold work the same as with a full frame search. While the
+    hand is lost the full frame search only runs every full_search_every
+    frames.
+    """
+
+    def __init__(self, full_frame_hands, roi_hands, roi_scale=1.5, min_roi=64,
+                 min_visibility=0.5, lost_after=5, full_search_every=5):
+        self.full_frame_hands = full_frame_hands
+        self.roi_hands = roi_hands
+        self.roi_scale = roi_scale  # Crop side as a multiple of the shoulder width
+        self.min_roi = min_roi
+        self.min_visibility = min_visibility
+        self.lost_after = lost_after
+        self.full_search_every = full_search_every
+
+        self.arm = 0  # Arm whose crop is searched next
+        self.misses = lost_after - 1  # Start with a full frame search
+        self.last_roi = None  # (x0, y0, x1, y1) of the last crop, for drawing
+
+    def roi_for_arm(self, landmarks, arm, w, h):
+        elbow_index, wrist_index = ARMS[arm]
+        wrist = landmarks[wrist_index]
+        if wrist.visibility < self.min_visibility:
+            return None
+
+        left_shoulder = landmarks[LEFT_SHOULDER]
+        right_shoulder = landmarks[RIGHT_SHOULDER]
+        shoulder_width = abs(left_shoulder.x - right_shoulder.x) * w
+        side = max(self.min_roi, int(shoulder_width * self.roi_scale))
+        side = min(side, w, h)
+
+        cx, cy = wrist.x * w, wrist.y * h
+        elbow = landmarks[elbow_index]
+        if elbow.visibility >= self.min_visibility:
+            # The hand sits past the wrist along the forearm
+            dx, dy = (wrist.x - elbow.x) * w, (wrist.y - elbow.y) * h
+            length = (dx * dx + dy * dy) ** 0.5
+            if length > 0:
+                cx += dx / length * side * 0.25
+                cy += dy / length * side * 0.25
+
+        x0 = int(min(max(cx - side / 2, 0), w - side))
+        y0 = int(min(max(cy - side / 2, 0), h - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def search_roi(self, image_rgb, roi):
+        x0, y0, x1, y1 = roi
+        results = self.roi_hands.process(np.ascontiguousarray(image_rgb[y0:y1, x0:x1]))
+        if not results.multi_hand_landmarks:
+            return None
+
+        # Map crop coordinates back to the full frame
+        h, w, _ = image_rgb.shape
+        hand_landmarks = results.multi_hand_landmarks[0]
+        for landmark in hand_landmarks.landmark:
+            landmark.x = (x0 + landmark.x * (x1 - x0)) / w
+            landmark.y = (y0 + landmark.y * (y1 - y0)) / h
+        return hand_landmarks
+
+    def process(self, image_rgb, pose_landmarks):
+        """Returns the landmarks of one hand, or None."""
+        h, w, _ = image_rgb.shape
+        self.last_roi = None
+
+        if pose_landmarks is not None:
+            # One crop per frame, alternating arms while nothing is found
+            landmarks = pose_landmarks.landmark
+            roi = self.roi_for_arm(landmarks, self.arm, w, h)
+            if roi is None:
+                self.arm = 1 - self.arm
+                roi = self.roi_for_arm(landmarks, self.arm, w, h)
+            if roi is not None:
+                self.last_roi = roi
+                hand_landmarks = self.search_roi(image_rgb, roi)
+                if hand_landmarks is not None:
+                    self.misses = 0
+                    return hand_landmarks
+                self.arm = 1 - self.arm
+
+        # Tracking lost, search the whole frame every few frames until
+        # the hand shows up again
+        self.misses += 1
+        if self.misses < self.lost_after or (self.misses - self.lost_after) % self.full_search_every:
+            return None
+
+        results = self.full_frame_hands.process(image_rgb)
+        if not results.multi_hand_landmarks:
+            return None
+
+        hand_landmarks = results.multi_hand_landmarks[0]
+        self.misses = 0
+        if pose_landmarks is not None:
+            # Continue with the crop around whichever wrist is closer
+            wrist = hand_landmarks.landmark[0]
+            distances = [
+                (pose_landmarks.landmark[wrist_index].x - wrist.x) ** 2 + (pose_landmarks.landmark[wrist_index].y - wrist.y) ** 2
+                for _, wrist_index in ARMS
+            ]
+            self.arm = distances.index(min(distances))
+        return hand_landmarks
+
+    def draw_roi(self, image):
+        if self.last_roi is not None:
+            x0, y0, x1, y1 = self.last_roi
+            cv2.rectangle(image, (x0, y0), (x1, y1), (0, 255, 255), 1)
+
+
+class LatestFrameGrabber:
+    """Reads the camera on its own thread and keeps only the newest frame.
+
+    cap.read() in the inference loop hands out frames that queued up in
+    the capture buffer while we were busy, so the controls lag behind
+    the player. Here a thread reads continuously into a single slot that
+    each new frame overwrites, and read() always returns the freshest
+    one, so a frame is never older than one inference when it's used.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.cond = threading.Condition()
+        self.frame = None
+        self.timestamp = 0.0
+        self.seq = 0
+        self.dropped = 0  # Frames overwritten before anyone read them
+        self.running = False
+        self.thread = None
+
+        # Ask the backend not to queue frames on its side either
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def _run(self):
+        while self.running:
+            success, frame = self.cap.read()
+            if not success:
+                time.sleep(0.005)
+                continue
+            with self.cond:
+                self.frame = frame
+                self.timestamp = time.monotonic()
+                self.seq += 1
+                self.cond.notify_all()
+
+    def read(self, last_seq, timeout=1.0):
+        """Waits for a frame newer than last_seq.
+
+        Returns (seq, frame, timestamp) with the capture time from
+        time.monotonic(), or None if no new frame came within timeout.
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.seq != last_seq, timeout):
+                return None
+            if last_seq:
+                self.dropped += self.seq - last_seq - 1
+            return self.seq, self.frame, self.timestamp
+
+
+class FramePacer:
+    """Runs the camera loop at a target rate without a fixed sleep.
+
+    wait() sleeps only what is left of the current frame's budget, so a
+    slow frame is followed by no sleep at all. When the loop falls more
+    than a frame behind, the missed ticks are skipped rather than
+    rushed through, and the schedule restarts from now. A slow machine
+    just runs at the rate it manages. A fast one takes a fresh frame
+    right at each tick.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_tick = None
+        self.skipped = 0  # Ticks dropped because the loop was behind
+
+    def wait(self):
+        """Sleeps until the next tick, returns the seconds slept."""
+        now = perf_counter()
+        if self.next_tick is None:
+            self.next_tick = now
+            return 0.0
+
+        self.next_tick += self.interval
+        delay = self.next_tick - now
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+
+        behind = int(-delay / self.interval)
+        if behind:
+            self.skipped += behind
+            self.next_tick = now
+        return 0.0
+
+
+def run_camera(running, status, skipped, events_name, preview_name, timings_name,
+               frame_size=(400, 300), hand_roi=True, control_rate=30, show_window=False):
+    """The camera process: gestures from the webcam to the game.
+
+    Reads the camera, runs the pipeline and pushes lane and pinch events
+    to the event ring, the annotated frame to the shared preview and the
+    stage times to the shared timings, all attached by name. status is
+    set to CAMERA_READY once the models are loaded, or CAMERA_FAILED.
+    skipped counts the control ticks the loop was too slow for. The loop
+    runs until running is cleared.
+    """
+    cap = None
+    grabber = None
+    width, height = frame_size
+    preview = SharedFrame.attach(preview_name, (height, width, 3))
+    events = GestureEventRing.attach(events_name)
+    gestures = GestureDebouncer(events)
+    timings = StageTimings.attach(timings_name, CAMERA_STAGES)
+    try:
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            print("Failed to open camera")
+            status.value = CAMERA_FAILED
+            return
+
+        # Capture runs on its own thread, we always take the newest frame.
+        # It starts right away so the camera warms up while the models load.
+        grabber = LatestFrameGrabber(cap)
+        grabber.start()
+        last_seq = 0
+
+        pipeline = GesturePipeline(frame_size, hand_roi)
+        pacer = FramePacer(control_rate)
+        status.value = CAMERA_READY
+
+        while running.value:
+            slept = pacer.wait()
+            skipped.value = pacer.skipped
+            loop_start = time.perf_counter()
+            frame = grabber.read(last_seq)
+            if frame is None:
+                continue
+            last_seq, image, captured_at = frame
+            captured = time.perf_counter()
+
+            # Resize, pose, hand, draw. lane is None without a pose,
+            # pinch_distance is None without a hand
+            image, lane, pinch_distance = pipeline.process(image)
+
+            # Shoulder-based movement detection
+            if lane is not None:
+                gestures.update_lane(lane, captured_at)
+
+            # A pinch starts a shot, opening it or losing the hand for a few frames ends it
+            gestures.update_pinch(pinch_distance, captured_at)
+
+            # Visual feedback
+            overlay_start = time.perf_counter()
+            position_text = "LEFT" if gestures.lane == -1 else "RIGHT" if gestures.lane == 1 else "CENTER"
+            cv2.putText(image, f"Position: {position_text}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+            cv2.putText(image, f"Shoot: {gestures.pinching}", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+            # Hand the frame to the game's CameraPreview
+            display_start = time.perf_counter()
+            preview.publish(image)
+
+            if show_window:
+                cv2.imshow('Shoulder Controls', image)
+                if cv2.waitKey(1) & 0xFF == 27:
+                    running.value = False
+
+            done = time.perf_counter()
+            stages = dict(pipeline.timings)
+            stages["pace"] = slept
+            stages["capture"] = captured - loop_start
+            stages["annotate"] += display_start - overlay_start
+            stages["display"] = done - display_start
+            stages["total"] = done - loop_start
+            timings.record(stages)
+
+    except Exception as e:
+        print(f"Camera process error: {e}")
+        status.value = CAMERA_FAILED
+    finally:
+        if grabber is not None:
+            grabber.stop()
+        if cap is not None:
+            cap.release()
+        preview.close()
+        events.close()
+        timings.close()
+        if show_window:
+            cv2.destroyAllWindows()
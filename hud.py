@@ -0,0 +1,65 @@
+"""HUD counters that only touch their geometry when the value changes."""
+from ursina import Entity, Quad, Text, camera, color
+
+
+class HudCounter(Entity):
+    """A label followed by a number, like "Score: 120".
+
+    Setting Text.text rebuilds the text geometry, even for the same
+    string. Here the label is built once, and so is every digit glyph
+    for every digit position. set() returns right away when the value
+    didn't change. Otherwise it only enables and disables the glyphs of
+    the digits that changed, and nothing is rebuilt.
+
+    The box is centered on position, sized for max_digits.
+    """
+
+    def __init__(self, label, value=0, max_digits=6, font=None, text_color=color.white, background=True, **kwargs):
+        super().__init__(parent=camera.ui, **kwargs)
+        content = Entity(parent=self)
+        text_kwargs = dict(parent=content, origin=(-.5, 0), color=text_color)
+        if font:
+            text_kwargs["font"] = font
+        self.label = Text(label, **text_kwargs)
+
+        # slots[position][digit], with at most one glyph enabled per position
+        self.slots = []
+        for _ in range(max_digits):
+            glyphs = [Text(str(digit), **text_kwargs) for digit in range(10)]
+            for glyph in glyphs:
+                glyph.enabled = False
+            self.slots.append(glyphs)
+
+        advance = max(glyph.width for glyph in self.slots[0])
+        for position, glyphs in enumerate(self.slots):
+            for glyph in glyphs:
+                glyph.x = self.label.width + position * advance
+        width = self.label.width + max_digits * advance
+        content.x = -width / 2
+
+        if background:
+            padding = Text.size * 2
+            Entity(parent=self, model=Quad(radius=Text.size, scale=(width + padding, self.label.height + padding)),
+                   color=color.black66, z=.01)
+
+        self.max_value = 10 ** max_digits - 1
+        self.shown = [None] * max_digits  # Digit shown at each position
+        self.value = None
+        self.set(value)
+
+    def set(self, value):
+        if value == self.value:
+            return
+        self.value = value
+
+        digits = str(max(0, min(value, self.max_value)))
+        for position, glyphs in enumerate(self.slots):
+            digit = int(digits[position]) if position < len(digits) else None
+            shown = self.shown[position]
+            if digit == shown:
+                continue
+            if shown is not None:
+                glyphs[shown].enabled = False
+            if digit is not None:
+                glyphs[digit].enabled = True
+            self.shown[position] = digit
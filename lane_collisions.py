@@ -0,0 +1,80 @@
+"""Collision checks for the lane games.
+
+Everything that collides sits in one of the lanes, so two entities can
+only touch when they are in the same lane, and then only their y ranges
+matter. Invaders are bucketed by lane and sorted by y once per frame,
+and finding what a bullet hit is a bisect in one lane's bucket rather
+than a test against every collider in the scene.
+
+Entities need a half_height, half their collider's height in the
+coordinates they move in. y_attr names the attribute their y is read
+from, for games that keep simulated positions apart from drawn ones.
+"""
+from bisect import bisect_left
+from operator import itemgetter
+
+
+class LaneCollisions:
+    def __init__(self, lanes, y_attr="y"):
+        self.lanes = list(lanes)
+        self.y_attr = y_attr
+        # Further than half the lane spacing from every lane is in no lane
+        self.half_width = min(b - a for a, b in zip(self.lanes, self.lanes[1:])) / 2
+        self.buckets = [[] for _ in self.lanes]  # (y, target), sorted by y
+        self.keys = [[] for _ in self.lanes]  # Just the ys, for bisect
+        self.max_half_height = 0
+
+    def lane_of(self, entity):
+        x = entity.x
+        lane = min(range(len(self.lanes)), key=lambda i: abs(self.lanes[i] - x))
+        if abs(self.lanes[lane] - x) > self.half_width:
+            return None
+        return lane
+
+    def overlaps(self, a, b):
+        lane = self.lane_of(a)
+        return (
+            lane is not None
+            and lane == self.lane_of(b)
+            and abs(getattr(a, self.y_attr) - getattr(b, self.y_attr)) < a.half_height + b.half_height
+        )
+
+    def update(self, targets):
+        """Buckets the targets by lane. Call it after every move of the targets."""
+        for bucket in self.buckets:
+            bucket.clear()
+        self.max_half_height = 0
+        for target in targets:
+            lane = self.lane_of(target)
+            if lane is not None:
+                self.buckets[lane].append((getattr(target, self.y_attr), target))
+                self.max_half_height = max(self.max_half_height, target.half_height)
+        for lane, bucket in enumerate(self.buckets):
+            bucket.sort(key=itemgetter(0))
+            self.keys[lane] = [y for y, _ in bucket]
+
+    def hit(self, entity):
+        """The lowest target entity overlaps, or None."""
+        lane = self.lane_of(entity)
+        if lane is None:
+            return None
+
+        y = getattr(entity, self.y_attr)
+        keys = self.keys[lane]
+        bucket = self.buckets[lane]
+        i = bisect_left(keys, y - entity.half_height - self.max_half_height)
+        while i < len(keys) and keys[i] < y + entity.half_height + self.max_half_height:
+            target = bucket[i][1]
+            if abs(keys[i] - y) < entity.half_height + target.half_height:
+                return target
+            i += 1
+        return None
+
+    def discard(self, target):
+        """Takes a target out until the next update(), e.g. once it was hit and moved."""
+        for lane, bucket in enumerate(self.buckets):
+            for i, (_, other) in enumerate(bucket):
+                if other is target:
+                    del bucket[i]
+                    del self.keys[lane][i]
+                    return
@@ -0,0 +1,171 @@
+"""All-time and per-day leaderboards of final scores.
+
+Each board keeps its games in an indexable skip list ordered best first,
+so adding a game, reading a page from any offset and finding a player's
+rank all take O(log n) (plus the page length) without scanning history.
+"""
+import random
+import time
+
+MAX_LEVEL = 32  # Enough levels for far more games than we will ever see
+
+
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, level):
+        self.value = value
+        self.next = [None] * level
+        # width[i] is how many positions next[i] is ahead of this node
+        self.width = [1] * level
+
+
+class IndexedSkipList:
+    """Sorted list of unique values with O(log n) insert, rank and indexing."""
+
+    def __init__(self):
+        self.head = _Node(None, MAX_LEVEL)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, value):
+        chain = [None] * MAX_LEVEL
+        steps_at_level = [0] * MAX_LEVEL
+        node = self.head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        # Geometric level, each level half as likely as the one below
+        height = 1
+        while height < MAX_LEVEL and random.random() < 0.5:
+            height += 1
+
+        new = _Node(value, height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, MAX_LEVEL):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def rank(self, value):
+        """0-based position of value, or None if it isn't in the list."""
+        node = self.head
+        position = 0
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].value < value:
+                position += node.width[level]
+                node = node.next[level]
+        node = node.next[0]
+        if node is None or node.value != value:
+            return None
+        return position
+
+    def slice(self, offset, limit):
+        """Up to limit values starting at position offset."""
+        if offset >= self.size or limit <= 0:
+            return []
+
+        node = self.head
+        remaining = offset + 1
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        values = []
+        while node is not None and len(values) < limit:
+            values.append(node.value)
+            node = node.next[0]
+        return values
+
+
+class Leaderboard:
+    """Finished games of one board, best score first.
+
+    Games are stored as (-score, timestamp, seq, room, player_id) so ties
+    go to whoever got there first. A player's rank is the rank of their
+    best game.
+    """
+
+    def __init__(self):
+        self.index = IndexedSkipList()
+        self.best = {}  # (room, player_id) -> best game
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, room, player_id, score, timestamp):
+        game = (-score, timestamp, self.seq, room, player_id)
+        self.seq += 1
+        self.index.insert(game)
+
+        best = self.best.get((room, player_id))
+        if best is None or game < best:
+            self.best[(room, player_id)] = game
+
+    def page(self, offset, limit):
+        return [
+            entry(offset + i, game)
+            for i, game in enumerate(self.index.slice(offset, limit))
+        ]
+
+    def rank(self, room, player_id):
+        game = self.best.get((room, player_id))
+        if game is None:
+            return None
+        return entry(self.index.rank(game), game)
+
+
+def entry(position, game):
+    neg_score, timestamp, _, room, player_id = game
+    return {
+        "rank": position + 1,
+        "room": room,
+        "player_id": player_id,
+        "score": -neg_score,
+        "time": timestamp,
+    }
+
+
+def day_of(timestamp):
+    # Boards are per local calendar day of the cabinet site
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class Leaderboards:
+    """The all-time board plus one board per day."""
+
+    ALL_TIME = "all"
+
+    def __init__(self):
+        self.boards = {self.ALL_TIME: Leaderboard()}
+        self.seen = set()  # (room, player_id, timestamp) of every game added
+
+    def add(self, room, player_id, score, timestamp):
+        # Returns the names of the boards that changed. The broker replays
+        # every final when a worker reconnects, those are ignored.
+        key = (room, player_id, timestamp)
+        if key in self.seen:
+            return ()
+        self.seen.add(key)
+        day = day_of(timestamp)
+        if day not in self.boards:
+            self.boards[day] = Leaderboard()
+        self.boards[self.ALL_TIME].add(room, player_id, score, timestamp)
+        self.boards[day].add(room, player_id, score, timestamp)
+        return (self.ALL_TIME, day)
+
+    def get(self, name):
+        return self.boards.get(name)
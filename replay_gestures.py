@@ -0,0 +1,160 @@
+"""Replays recorded videos through the gesture pipeline.
+
+Runs the same detection as the games' camera process (resize, pose,
+hand, lane zones, pinch and the debouncing in front of the event ring)
+on video files instead of the webcam, headless and as fast as it can.
+Every frame is processed, none are skipped, so two runs over the same
+recording can be compared.
+
+    python replay_gestures.py recording.mp4
+    python replay_gestures.py a.mp4 b.mp4 --decisions decisions.csv --output results.json
+    python replay_gestures.py recording.mp4 --no-roi --no-annotate
+
+Frames are timestamped from the video's frame rate, so events line up
+with the recording and not with how fast it was replayed.
+"""
+import argparse
+import csv
+import json
+from time import perf_counter
+
+import cv2
+
+from gesture_events import LANE, PINCH_END, PINCH_START, GestureDebouncer
+from gesture_pipeline import GesturePipeline
+
+EVENT_NAMES = {LANE: "lane", PINCH_START: "pinch_start", PINCH_END: "pinch_end"}
+
+
+class EventRecorder:
+    """Stands in for the event ring, keeping what the debouncer pushes."""
+
+    def __init__(self):
+        self.events = []
+
+    def push(self, kind, value=0, timestamp=0.0):
+        self.events.append((kind, value, timestamp))
+        return True
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def replay(path, pipeline, writer, stage_times):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+
+    recorder = EventRecorder()
+    gestures = GestureDebouncer(recorder)
+    frames = 0
+    try:
+        while True:
+            start = perf_counter()
+            success, frame = cap.read()
+            if not success:
+                break
+            stage_times["read"].append(perf_counter() - start)
+
+            timestamp = frames / fps
+            _, lane, pinch_distance = pipeline.process(frame)
+            for stage, seconds in pipeline.timings.items():
+                stage_times[stage].append(seconds)
+
+            pushed = len(recorder.events)
+            if lane is not None:
+                gestures.update_lane(lane, timestamp)
+            gestures.update_pinch(pinch_distance, timestamp)
+            stage_times["total"].append(perf_counter() - start)
+
+            if writer is not None:
+                events = " ".join(
+                    f"{EVENT_NAMES[kind]}:{value}" if kind == LANE else EVENT_NAMES[kind]
+                    for kind, value, _ in recorder.events[pushed:]
+                )
+                writer.writerow([
+                    path, frames, f"{timestamp:.3f}",
+                    "" if lane is None else lane,
+                    "" if pinch_distance is None else f"{pinch_distance:.4f}",
+                    gestures.lane, int(gestures.pinching), events,
+                ])
+            frames += 1
+    finally:
+        cap.release()
+    return frames, recorder.events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+", help="Recorded video files")
+    parser.add_argument("--size", default="400x300", help="Frame size the pipeline runs at, as in the games")
+    parser.add_argument("--no-roi", action="store_true", help="Search the full frame for the hand (HAND_ROI = False)")
+    parser.add_argument("--no-annotate", action="store_true", help="Skip drawing on the frame")
+    parser.add_argument("--decisions", help="Write per frame decisions as CSV to this file")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    width, height = (int(n) for n in args.size.split("x"))
+    load_start = perf_counter()
+    pipeline = GesturePipeline((width, height), hand_roi=not args.no_roi, annotate=not args.no_annotate)
+    load_time = perf_counter() - load_start
+
+    stage_times = {stage: [] for stage in ("read",) + GesturePipeline.STAGES + ("total",)}
+    decisions = open(args.decisions, "w", newline="") if args.decisions else None
+    writer = None
+    if decisions is not None:
+        writer = csv.writer(decisions)
+        writer.writerow(["video", "frame", "time", "zone", "pinch_distance", "lane", "pinching", "events"])
+
+    frames = 0
+    events = []
+    start = perf_counter()
+    try:
+        for path in args.videos:
+            video_frames, video_events = replay(path, pipeline, writer, stage_times)
+            frames += video_frames
+            events.extend(video_events)
+    finally:
+        if decisions is not None:
+            decisions.close()
+    elapsed = perf_counter() - start
+
+    if not frames:
+        raise SystemExit("No frames could be read")
+
+    stages = {
+        stage: {
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p50_ms": percentile(times, 50) * 1000,
+            "p99_ms": percentile(times, 99) * 1000,
+        }
+        for stage, times in stage_times.items()
+    }
+    results = {
+        "videos": args.videos,
+        "size": args.size,
+        "hand_roi": not args.no_roi,
+        "annotate": not args.no_annotate,
+        "model_load_seconds": load_time,
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed,
+        "events": {name: sum(1 for kind, _, _ in events if kind == k) for k, name in EVENT_NAMES.items()},
+        "stages": stages,
+    }
+
+    print(f"{frames} frames in {elapsed:.1f}s ({results['fps']:.1f} fps), models loaded in {load_time:.1f}s")
+    for stage, timing in stages.items():
+        print(f"  {stage:<10} mean {timing['mean_ms']:6.2f} ms  p50 {timing['p50_ms']:6.2f} ms  p99 {timing['p99_ms']:6.2f} ms")
+    print("events: " + ", ".join(f"{name} {count}" for name, count in results["events"].items()))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
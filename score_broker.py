@@ -0,0 +1,152 @@
+"""Local pub/sub backplane for running server.py with several workers.
+
+The broker is a small process listening on a Unix socket. Every worker
+connects to it, publishes the score changes and resets it handles
+itself, and applies the ones relayed from the other workers, so a score
+ingested by any worker reaches viewers on all of them. With a log
+directory the broker is also the single writer of the score log.
+
+Messages are newline framed text lines:
+
+    room:player_id:score                    a score change
+    !final:room:player_id:score:timestamp   a finished game
+    !reset:room                             a reset from a scoreboard in that room
+
+The broker remembers the finished games and the latest score line per
+(room, player) and replays them to a worker when it connects, so new or
+restarted workers start with the shared state.
+"""
+import asyncio
+import os
+import signal
+
+from score_log import ScoreLog
+
+# A worker that falls this far behind is dropped, it resyncs on reconnect
+MAX_WORKER_BUFFER = 1024 * 1024
+
+
+class ScoreBroker:
+    def __init__(self, path, log_dir=None):
+        self.path = path
+        self.writers = set()
+        self.state = {}  # b"room:player_id" -> latest score line
+        self.finals = []  # !final lines, oldest first
+        self.score_log = ScoreLog(log_dir) if log_dir else None
+
+    async def handle_worker(self, reader, writer):
+        # Finals first, so their scores don't override the current ones
+        for line in self.finals:
+            writer.write(line)
+        for line in self.state.values():
+            writer.write(line)
+        self.writers.add(writer)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    continue
+
+                if line.startswith(b"!final:"):
+                    self.finals.append(line)
+                    if self.score_log is not None:
+                        room, player_id, score, timestamp = line[7:].decode("utf-8").strip().split(":")
+                        self.score_log.append(room, player_id, score, float(timestamp), final=True)
+                elif not line.startswith(b"!"):
+                    key, _, score = line.rpartition(b":")
+                    self.state[key] = line
+                    if self.score_log is not None:
+                        room, _, player_id = key.decode("utf-8").partition(":")
+                        self.score_log.append(room, player_id, score.decode("utf-8").strip())
+
+                for other in list(self.writers):
+                    if other is writer:
+                        continue
+                    if other.transport.get_write_buffer_size() > MAX_WORKER_BUFFER:
+                        print("Dropping stalled worker from the backplane")
+                        self.writers.discard(other)
+                        other.close()
+                        continue
+                    other.write(line)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def serve(self):
+        if self.score_log is not None:
+            for room, players in self.score_log.recover().items():
+                for player_id, score in players.items():
+                    self.state[f"{room}:{player_id}".encode("utf-8")] = f"{room}:{player_id}:{score}\n".encode("utf-8")
+            for room, player_id, score, timestamp in self.score_log.finals:
+                self.finals.append(f"!final:{room}:{player_id}:{score}:{timestamp!r}\n".encode("utf-8"))
+            sync_task = asyncio.create_task(self.score_log.run())
+
+        # The parent stops us with SIGTERM, unwind so the log gets flushed
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+        # A socket file left behind by a previous run would make bind fail
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        server = await asyncio.start_unix_server(self.handle_worker, path=self.path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.score_log is not None:
+                sync_task.cancel()
+                self.score_log.close()
+
+
+def run_broker(path, log_dir=None):
+    try:
+        asyncio.run(ScoreBroker(path, log_dir).serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+class BackplaneClient:
+    """A worker's connection to the broker.
+
+    publish() only writes into the transport buffer and never waits.
+    run() keeps the connection up and hands every relayed line to
+    on_message.
+    """
+
+    def __init__(self, path, on_message, max_backoff=5.0):
+        self.path = path
+        self.on_message = on_message
+        self.max_backoff = max_backoff
+        self.writer = None
+
+    def publish(self, line):
+        writer = self.writer
+        if writer is None or writer.is_closing():
+            return
+        writer.write(f"{line}\n".encode('utf-8'))
+
+    async def run(self):
+        backoff = 0.1
+        while True:
+            try:
+                reader, self.writer = await asyncio.open_unix_connection(self.path)
+                backoff = 0.1
+                while True:
+                    data = await reader.readline()
+                    if not data:
+                        break
+                    self.on_message(data.decode('utf-8').strip())
+            except (ConnectionError, FileNotFoundError, ValueError) as e:
+                print(f"Backplane connection error: {e}")
+            finally:
+                if self.writer is not None:
+                    self.writer.close()
+                    self.writer = None
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,214 @@
+"""Append-only binary log of ingested score events.
+
+Every score change is appended to the active segment file as
+
+    <payload length:u32> <crc32:u32> <timestamp:f64> <payload>
+
+where payload is the utf-8 "room:player_id:score" line, with ":final"
+appended for the final score of a finished game. Writes only go
+to the file buffer, a background task flushes and fsyncs them in
+batches. When a segment grows past segment_size a new one is started
+and a JSON snapshot of all scores is written next to it, so older
+segments can be deleted and restart only has to replay the snapshot
+plus the segments after it. The fsyncs and the snapshot write of a
+rotation happen on a background thread, off the event loop.
+
+Finished games are never dropped, so they don't go into snapshots. They
+are also appended to finals.log, in the same record format, which is
+never rotated.
+"""
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+HEADER = struct.Struct("<IId")
+SEGMENT_SUFFIX = ".log"
+SNAPSHOT_SUFFIX = ".snapshot.json"
+FINALS_FILE = "finals.log"
+
+
+class ScoreLog:
+    def __init__(self, directory, segment_size=16 * 1024 * 1024, fsync_interval=0.5, keep_segments=2):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self.keep_segments = keep_segments  # Segments kept before the latest snapshot
+
+        self.state = {}  # room -> {player_id: score}
+        self.finals = []  # [room, player_id, score, timestamp] per finished game
+        self.file = None
+        self.finals_file = None
+        self.segment = 0
+        self.dirty = False
+        # One thread, so rotations finish in order
+        self.rotations = ThreadPoolExecutor(max_workers=1)
+
+    def segment_path(self, number):
+        return os.path.join(self.directory, f"{number:012d}{SEGMENT_SUFFIX}")
+
+    def snapshot_path(self, number):
+        return os.path.join(self.directory, f"{number:012d}{SNAPSHOT_SUFFIX}")
+
+    def list_numbers(self, suffix):
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.endswith(suffix):
+                try:
+                    numbers.append(int(name[:-len(suffix)]))
+                except ValueError:
+                    pass
+        return sorted(numbers)
+
+    def recover(self):
+        """Rebuild the scores from the latest snapshot and the log after it.
+
+        Opens the last segment for appending, cutting off a torn record
+        left by a crash. Returns {room: {player_id: score}}, the finished
+        games are in self.finals afterwards.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshots = self.list_numbers(SNAPSHOT_SUFFIX)
+        start = 0
+        if snapshots:
+            start = snapshots[-1]
+            with open(self.snapshot_path(start)) as f:
+                snapshot = json.load(f)
+            self.state = snapshot["scores"]
+
+        segments = [n for n in self.list_numbers(SEGMENT_SUFFIX) if n >= start]
+        valid_end = 0
+        for number in segments:
+            valid_end = self.replay(self.segment_path(number), self.apply_score)
+
+        finals_path = os.path.join(self.directory, FINALS_FILE)
+        finals_end = self.replay(finals_path, self.apply_final) if os.path.exists(finals_path) else 0
+        self.finals_file = open(finals_path, "ab")
+        self.finals_file.truncate(finals_end)
+
+        if segments:
+            self.segment = segments[-1]
+            self.file = open(self.segment_path(self.segment), "r+b")
+            self.file.truncate(valid_end)
+            self.file.seek(valid_end)
+        else:
+            self.segment = start
+            self.file = open(self.segment_path(self.segment), "ab")
+
+        return self.state
+
+    def apply_score(self, room, player_id, score, timestamp):
+        self.state.setdefault(room, {})[player_id] = score
+
+    def apply_final(self, room, player_id, score, timestamp):
+        self.finals.append([room, player_id, score, timestamp])
+
+    def replay(self, path, apply):
+        # Calls apply(room, player_id, score, timestamp) per record,
+        # returns the offset after the last intact one
+        with open(path, "rb") as f:
+            data = f.read()
+
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            length, crc, timestamp = HEADER.unpack_from(data, offset)
+            end = offset + HEADER.size + length
+            if end > len(data):
+                break
+            payload = data[offset + HEADER.size:end]
+            if zlib.crc32(payload, zlib.crc32(struct.pack("<d", timestamp))) != crc:
+                break
+
+            room, player_id, score, *_ = payload.decode("utf-8").split(":")
+            apply(room, player_id, score, timestamp)
+            offset = end
+        return offset
+
+    def append(self, room, player_id, score, timestamp=None, final=False):
+        if timestamp is None:
+            timestamp = time.time()
+        payload = f"{room}:{player_id}:{score}{':final' if final else ''}".encode("utf-8")
+        crc = zlib.crc32(payload, zlib.crc32(struct.pack("<d", timestamp)))
+        record = HEADER.pack(len(payload), crc, timestamp) + payload
+        self.file.write(record)
+        self.dirty = True
+        self.apply_score(room, player_id, score, timestamp)
+        if final:
+            self.finals_file.write(record)
+            self.apply_final(room, player_id, score, timestamp)
+
+        if self.file.tell() >= self.segment_size:
+            self.rotate()
+
+    def rotate(self):
+        # Only the cheap part runs here: switch to a new segment and copy
+        # the scores. Syncing the old segment, the snapshot and the
+        # cleanup are left to the rotation thread.
+        old = self.file
+        old.flush()
+        self.segment += 1
+        self.file = open(self.segment_path(self.segment), "ab")
+        scores = {room: dict(players) for room, players in self.state.items()}
+        self.rotations.submit(self.finish_rotation, old, self.segment, scores)
+
+    def finish_rotation(self, old, number, scores):
+        os.fsync(old.fileno())
+        old.close()
+        self.write_snapshot(number, scores)
+
+        # Everything before the snapshot is covered by it, keep a few
+        # segments around anyway for inspection
+        for n in self.list_numbers(SEGMENT_SUFFIX):
+            if n < number - self.keep_segments:
+                os.unlink(self.segment_path(n))
+        for n in self.list_numbers(SNAPSHOT_SUFFIX):
+            if n < number:
+                os.unlink(self.snapshot_path(n))
+
+    def write_snapshot(self, number, scores):
+        # Scores as of the start of segment `number`, written atomically
+        path = self.snapshot_path(number)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"scores": scores}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def files(self):
+        return [f for f in (self.file, self.finals_file) if f is not None]
+
+    def sync(self):
+        if self.dirty:
+            for f in self.files():
+                f.flush()
+                os.fsync(f.fileno())
+            self.dirty = False
+
+    async def run(self):
+        """Flush and fsync whatever was appended, every fsync_interval."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            if self.dirty:
+                self.dirty = False
+                for f in self.files():
+                    f.flush()
+                    # fsync can take a while, keep it off the event loop
+                    try:
+                        await loop.run_in_executor(None, os.fsync, f.fileno())
+                    except (OSError, ValueError):
+                        # Closed meanwhile, which already synced it
+                        pass
+
+    def close(self):
+        # Let a rotation that is still going finish its snapshot
+        self.rotations.shutdown(wait=True)
+        self.sync()
+        for f in self.files():
+            f.close()
+        self.file = self.finals_file = None
@@ -0,0 +1,148 @@
+import select
+import socket
+import threading
+import time
+from collections import deque
+
+
+class ScoreUplink:
+    """Keeps one long-lived TCP connection to the score server.
+
+    The game only calls send(), which appends to a bounded queue and
+    returns immediately. A background thread resolves the address once,
+    connects, writes newline framed messages and reconnects with backoff
+    when the tunnel drops.
+
+    While there is nothing to send it writes an empty line every
+    heartbeat_interval seconds, which the server skips. That keeps the
+    server's read timeout from closing the connection during a long game
+    over screen.
+    """
+
+    def __init__(self, host, port, max_queue=64, connect_timeout=5.0,
+                 min_backoff=0.5, max_backoff=10.0, heartbeat_interval=10.0):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        # Oldest messages fall off when the queue is full, a newer score
+        # always supersedes an older one anyway
+        self.queue = deque(maxlen=max_queue)
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.sock = None
+        self.address = None
+        self.dropped = 0
+
+    def send(self, message):
+        """Queue a message for the server. Never blocks."""
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(message)
+            self.cond.notify()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self, flush_timeout=1.0):
+        # Give queued messages (e.g. the final score) a moment to go out
+        # Wake the thread in case it is backing off after a dropped connection
+        with self.cond:
+            self.cond.notify()
+        deadline = time.time() + flush_timeout
+        while self.queue and time.time() < deadline:
+            time.sleep(0.01)
+
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread:
+            self.thread.join(timeout=flush_timeout)
+        self._close()
+
+    def _resolve(self):
+        # Cache the lookup, it is only redone after a failed connect
+        if self.address is None:
+            info = socket.getaddrinfo(self.host, self.port, socket.AF_UNSPEC, socket.SOCK_STREAM)
+            self.address = info[0]
+        return self.address
+
+    def _connect(self):
+        family, socktype, proto, _, sockaddr = self._resolve()
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(sockaddr)
+        except OSError:
+            sock.close()
+            raise
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.sock = sock
+
+    def _peer_closed(self):
+        # The server never writes to us, so a readable socket means it
+        # closed the connection (EOF) or the connection failed. sendall()
+        # would still succeed on it and the message would be lost.
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _run(self):
+        backoff = self.min_backoff
+        while self.running:
+            with self.cond:
+                if self.running and not self.queue:
+                    self.cond.wait(self.heartbeat_interval)
+                if not self.running:
+                    break
+                message = self.queue[0] if self.queue else None
+
+            if message is None:
+                if self.sock is None:
+                    continue  # Nothing to send and no connection to keep alive
+                data = b"\n"  # Heartbeat
+            else:
+                data = f"{message}\n".encode('utf-8')
+
+            try:
+                if self.sock is None:
+                    self._connect()
+                    backoff = self.min_backoff
+                elif self._peer_closed():
+                    raise ConnectionResetError("server closed the connection")
+                self.sock.sendall(data)
+            except OSError as e:
+                print(f"Score uplink error: {e}, retrying in {backoff:.1f}s")
+                self._close()
+                self.address = None
+                with self.cond:
+                    self.cond.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            if message is None:
+                continue
+            with self.cond:
+                # Only pop if it wasn't already pushed out by newer messages
+                if self.queue and self.queue[0] is message:
+                    self.queue.popleft()
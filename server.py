@@ -2,87 +2,543 @@ import os
 import time
 import uvicorn
 import asyncio
-import socket
 import json
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+import re
+import gzip
+import hashlib
+from collections import deque
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, HTTPException
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 from threading import Thread
+from multiprocessing import Process
+from score_broker import BackplaneClient, run_broker
+from score_log import ScoreLog
+from leaderboard import Leaderboards
+from metrics import Registry
 
-# Global scores dictionary and player slots tracking
-scores = {"player_1": "0", "player_2": "0"}  # Changed from player1/player2 to player_1/player_2
+try:
+    import brotli
+except ImportError:  # Optional, gzip is used when it's missing
+    brotli = None
 
-async def handle_tcp_connections(websockets_set):
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server.bind(('0.0.0.0', 8080))
-    server.listen(5)
-    server.setblocking(False)
+# Rooms (one per match) keyed by name, each with its own scores and viewers
+rooms = {}
+DEFAULT_ROOM = "default"  # Used by clients that don't send a room
+MAX_ROOMS = 1000
+MAX_PLAYERS_PER_ROOM = 16
+ROOM_IDLE_TIMEOUT = 30 * 60  # Seconds without scores or viewers before a room is dropped
+ROOM_SWEEP_INTERVAL = 60
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")  # Valid room and player IDs
 
-    while True:
+# Score ingest settings (ngrok forwards the public tcp tunnel to this port)
+TCP_HOST = '0.0.0.0'
+TCP_PORT = 8080
+TCP_BACKLOG = 1024
+TCP_READ_TIMEOUT = 30  # Seconds a station may stay silent before we drop it, uplinks send an empty heartbeat line every 10s
+MAX_MESSAGE_SIZE = 1024  # Longest "room:player_id:score" line we accept
+
+# Scoreboard viewer settings
+VIEWER_OUTBOX_SIZE = 8  # Messages a viewer may have queued before it's evicted
+VIEWER_SEND_TIMEOUT = 2.0  # Seconds a viewer may be stuck in one send before it's evicted
+
+# Score changes arriving within one tick go out as a single message per
+# viewer. Lower it for snappier scoreboards, raise it for more stations.
+BROADCAST_TICK = float(os.environ.get("BROADCAST_TICK", "0.05"))
+
+# Unix socket of the backplane broker, set by __main__ when running with
+# several workers so they share scores and resets
+BROKER_PATH = os.environ.get("SCORE_BROKER")
+backplane = None
+
+# Every score change is appended here and replayed on restart. Set it to
+# an empty string to keep scores in memory only.
+SCORE_LOG_DIR = os.environ.get(
+    "SCORE_LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "score_log")
+)
+score_log = None
+
+# Final scores of finished games, all-time and per day
+leaderboards = Leaderboards()
+leaderboard_broadcasters = {}  # board name -> Broadcaster of its WebSocket viewers
+LEADERBOARD_PAGE_SIZE = 10  # Entries per page, also what viewers get pushed
+MAX_LEADERBOARD_PAGE_SIZE = 100
+
+# Served at /metrics. With several workers each one keeps its own numbers.
+metrics = Registry()
+scores_ingested = metrics.counter("scores_ingested_total", "Score messages ingested", ("player_id",))
+METRIC_PLAYER_IDS = ("player_1", "player_2")  # Any other player is counted as "other"
+parse_errors = metrics.counter("score_parse_errors_total", "Score messages that could not be parsed")
+viewer_evictions = metrics.counter("viewer_evictions_total", "Scoreboard viewers evicted", ("reason",))
+broadcast_fanout = metrics.histogram("broadcast_fanout_seconds", "Time to encode and queue one broadcast for all viewers")
+viewer_send_latency = metrics.histogram("viewer_send_seconds", "Time a single WebSocket send to a viewer took")
+event_loop_lag = metrics.histogram("event_loop_lag_seconds", "How late the event loop woke up a sleeping task")
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+def encode_frame(payload):
+    # Same wire format as WebSocket.send_json, but done once per broadcast
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+class Viewer:
+    """A connected scoreboard browser with its own outbox and writer task.
+
+    Outbox entries are (kind, payload, frame) where frame is the already
+    encoded text shared by every viewer. Score updates are merged into
+    any score update still waiting in the outbox, so a slow viewer only
+    ever gets the latest state. Other messages (like "reset_acknowledged")
+    are queued in order.
+    """
+
+    def __init__(self, websocket, broadcaster):
+        self.websocket = websocket
+        self.broadcaster = broadcaster
+        self.outbox = deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.sending_since = None
+        self.task = asyncio.create_task(self.drain())
+
+    def offer(self, kind, payload, frame, merge=False):
+        if self.closed:
+            return
+
+        # Checked here instead of a timer per send, which costs a task each
+        if self.sending_since is not None and time.monotonic() - self.sending_since > VIEWER_SEND_TIMEOUT:
+            self.broadcaster.evict(self, "send timed out")
+            return
+
+        if merge:
+            for i, (queued_kind, queued, _) in enumerate(self.outbox):
+                if queued_kind == kind:
+                    # The merged payload is this viewer's own, encode it on send
+                    self.outbox[i] = (kind, {**queued, **payload}, None)
+                    return
+
+        if len(self.outbox) >= VIEWER_OUTBOX_SIZE:
+            self.broadcaster.evict(self, "outbox full")
+            return
+
+        self.outbox.append((kind, payload, frame))
+        self.ready.set()
+
+    async def drain(self):
         try:
-            client_socket, _ = await asyncio.get_event_loop().sock_accept(server)
-            data = await asyncio.get_event_loop().sock_recv(client_socket, 1024)
-            
-            if data:
-                message = data.decode('utf-8').strip()
-                # print(message)
-                # Remove the slot request handling since we're using fixed IDs
-                if ":" in message:
-                    # Handle score updates
-                    player_id, score = message.split(':')
-                    if player_id in ["player_1", "player_2"]:  # Verify valid player ID
-                        scores[player_id] = score
-                        
-                        # Broadcast scores to all connected WebSocket clients
-                        disconnected = set()
-                        for websocket in websockets_set:
-                            try:
-                                await websocket.send_json(scores)
-                            except WebSocketDisconnect:
-                                disconnected.add(websocket)
-                        
-                        # Remove disconnected clients
-                        websockets_set -= disconnected
-
-            client_socket.close()
-        except Exception as e:
-            print(f"Error handling TCP connection: {e}")
-            await asyncio.sleep(0.1)
+            while True:
+                await self.ready.wait()
+                while self.outbox:
+                    kind, payload, frame = self.outbox.popleft()
+                    if frame is None:
+                        frame = encode_frame(payload)
+                    started = self.sending_since = time.monotonic()
+                    await self.websocket.send_text(frame)
+                    self.sending_since = None
+                    viewer_send_latency.observe(time.monotonic() - started)
+                self.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # WebSocketDisconnect, RuntimeError after close, transport errors
+            self.broadcaster.evict(self, None)
+
+class Broadcaster:
+    """Fans messages out to every viewer without ever waiting on one.
+
+    Score changes are collected for one tick and then sent as a single
+    message holding only the players whose score changed.
+    """
+
+    def __init__(self, scores, tick=BROADCAST_TICK):
+        self.scores = scores
+        self.viewers = {}
+        self.tick = tick
+        self.changed = {}
+        self.flush_handle = None
+
+    def __len__(self):
+        return len(self.viewers)
+
+    def add(self, websocket):
+        viewer = Viewer(websocket, self)
+        self.viewers[websocket] = viewer
+        # Viewers only get deltas after this, so start them off with everything
+        if self.scores is not None:
+            viewer.offer("scores", dict(self.scores), None, merge=True)
+        return viewer
+
+    def remove(self, websocket):
+        viewer = self.viewers.pop(websocket, None)
+        if viewer is not None and not viewer.closed:
+            viewer.closed = True
+            viewer.outbox.clear()
+            viewer.task.cancel()
+
+    def evict(self, viewer, reason):
+        if viewer.closed:
+            return
+        if reason:
+            print(f"Evicting scoreboard viewer: {reason}")
+        viewer_evictions.inc(reason or "disconnected")
+        self.remove(viewer.websocket)
+        asyncio.create_task(self.close_websocket(viewer.websocket))
+
+    async def close_websocket(self, websocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=1008), VIEWER_SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    def publish_scores(self, changes):
+        self.changed.update(changes)
+        if self.tick <= 0:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.tick, self.flush)
+
+    def flush(self):
+        self.flush_handle = None
+        changed, self.changed = self.changed, {}
+        if not changed:
+            return
+        started = time.perf_counter()
+        frame = encode_frame(changed)
+        for viewer in list(self.viewers.values()):
+            viewer.offer("scores", changed, frame, merge=True)
+        broadcast_fanout.observe(time.perf_counter() - started)
+
+    def publish_text(self, text):
+        for viewer in list(self.viewers.values()):
+            viewer.offer("text", text, text)
+
+    def close(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        for websocket in list(self.viewers):
+            self.remove(websocket)
+
+class Room:
+    """Scores and scoreboard viewers of one match."""
+
+    __slots__ = ("name", "scores", "broadcaster", "last_score")
+
+    def __init__(self, name):
+        self.name = name
+        self.scores = {"player_1": "0", "player_2": "0"}
+        self.broadcaster = Broadcaster(self.scores)
+        self.last_score = time.monotonic()
+
+def find_room(name):
+    # Viewers only look rooms up, so a made up ?room= can't use up MAX_ROOMS
+    return rooms.get(name)
+
+def get_room(name):
+    # Rooms are created by score ingest on first use, up to MAX_ROOMS
+    room = rooms.get(name)
+    if room is None:
+        if len(rooms) >= MAX_ROOMS or not NAME_PATTERN.match(name):
+            return None
+        room = rooms[name] = Room(name)
+    return room
+
+def parse_score_message(message):
+    # "room:player_id:score", or "player_id:score" for the default room.
+    # Game over pushes end in ":final".
+    parts = message.split(':')
+    final = parts[-1] == "final"
+    if final:
+        parts.pop()
+
+    if len(parts) == 3:
+        room_name, player_id, score = parts
+    elif len(parts) == 2:
+        room_name = DEFAULT_ROOM
+        player_id, score = parts
+    else:
+        return None
+
+    if not NAME_PATTERN.match(player_id):  # Verify valid player ID
+        return None
+    if final and not score.isdigit():
+        return None
+    return room_name, player_id, score, final
+
+def apply_score(room_name, player_id, score):
+    # Returns True if the score changed
+    room = get_room(room_name)
+    if room is None:
+        return False
+    room.last_score = time.monotonic()
+
+    # Handle score updates
+    if player_id not in room.scores and len(room.scores) >= MAX_PLAYERS_PER_ROOM:
+        return False
+    if room.scores.get(player_id) == score:
+        return False
+    room.scores[player_id] = score
+
+    # Queue the change for the next broadcast tick, never waits on a send
+    room.broadcaster.publish_scores({player_id: score})
+    return True
+
+def record_final(room_name, player_id, score, timestamp):
+    # Adds a finished game to the leaderboards and pushes their new top pages
+    if room_name not in rooms:
+        return
+    for board in leaderboards.add(room_name, player_id, int(score), timestamp):
+        broadcaster = leaderboard_broadcasters.get(board)
+        if broadcaster is not None and len(broadcaster):
+            broadcaster.publish_text(encode_frame(leaderboard_page(board, 0, LEADERBOARD_PAGE_SIZE)))
+
+def handle_score_message(message):
+    parsed = parse_score_message(message)
+    if parsed is None:
+        parse_errors.inc()
+        return
+
+    room_name, player_id, score, final = parsed
+    if get_room(room_name) is None:
+        return
+    scores_ingested.inc(player_id if player_id in METRIC_PLAYER_IDS else "other")
+    changed = apply_score(room_name, player_id, score)
+    timestamp = time.time()
+    if final:
+        record_final(room_name, player_id, score, timestamp)
+    elif not changed:
+        return
+
+    if score_log is not None:
+        score_log.append(room_name, player_id, score, timestamp, final=final)
+    if backplane is not None:
+        if changed:
+            backplane.publish(f"{room_name}:{player_id}:{score}")
+        if final:
+            backplane.publish(f"!final:{room_name}:{player_id}:{score}:{timestamp!r}")
+
+def handle_backplane_message(line):
+    # Changes and resets relayed from the other workers, applied locally only
+    if line.startswith("!reset:"):
+        room = find_room(line[len("!reset:"):])
+        if room is not None:
+            room.broadcaster.publish_text("reset_acknowledged")
+        return
+
+    if line.startswith("!final:"):
+        room_name, player_id, score, timestamp = line[len("!final:"):].split(":")
+        get_room(room_name)
+        record_final(room_name, player_id, score, float(timestamp))
+        return
+
+    parsed = parse_score_message(line)
+    if parsed is not None:
+        apply_score(*parsed[:3])
+
+async def handle_score_client(reader, writer):
+    # Each station keeps its connection open and sends newline framed
+    # "room:player_id:score" messages. Old clients that send one
+    # unterminated message and close still work since readline returns it
+    # at EOF.
+    peer = writer.get_extra_info('peername')
+    try:
+        while True:
+            try:
+                data = await asyncio.wait_for(reader.readline(), TCP_READ_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"Score client {peer} timed out")
+                break
+            except ValueError:
+                # Line longer than MAX_MESSAGE_SIZE, the stream can't be resynced
+                print(f"Score client {peer} sent an oversized message")
+                parse_errors.inc()
+                break
+
+            if not data:
+                break
+
+            message = data.decode('utf-8', errors='replace').strip()
+            if message:
+                handle_score_message(message)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except Exception as e:
+        print(f"Error handling TCP connection: {e}")
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+async def handle_tcp_connections():
+    server = await asyncio.start_server(
+        handle_score_client,
+        TCP_HOST,
+        TCP_PORT,
+        backlog=TCP_BACKLOG,
+        limit=MAX_MESSAGE_SIZE,
+        reuse_address=True,
+        # Lets every worker listen on the ingest port, the kernel spreads
+        # connections between them
+        reuse_port=BROKER_PATH is not None,
+    )
+
+    async with server:
+        await server.serve_forever()
+
+async def sweep_idle_rooms():
+    # Drops rooms nobody watches or scores in anymore, the match is over.
+    # If a station scores there again the room starts over from scratch.
+    while True:
+        await asyncio.sleep(ROOM_SWEEP_INTERVAL)
+        cutoff = time.monotonic() - ROOM_IDLE_TIMEOUT
+        for name, room in list(rooms.items()):
+            if name != DEFAULT_ROOM and not len(room.broadcaster) and room.last_score < cutoff:
+                room.broadcaster.close()
+                del rooms[name]
+
+async def monitor_event_loop_lag():
+    # A sleep that wakes up late means something hogged the loop
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + EVENT_LOOP_LAG_INTERVAL
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+        event_loop_lag.observe(max(0.0, loop.time() - expected))
+
+def count_viewers():
+    return sum(len(room.broadcaster) for room in rooms.values()) + sum(
+        len(broadcaster) for broadcaster in leaderboard_broadcasters.values()
+    )
+
+metrics.gauge("scoreboard_viewers", "Connected scoreboard and leaderboard viewers", count_viewers)
+metrics.gauge("rooms", "Rooms with state on this worker", lambda: len(rooms))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create a set to store WebSocket connections
-    if not hasattr(app, 'websockets'):
-        app.websockets = set()
+    global backplane, score_log
+
+    # The default room always exists so old clients and the plain page work
+    get_room(DEFAULT_ROOM)
+
+    tasks = []
+    if BROKER_PATH:
+        # Join the other workers through the broker, which also owns the
+        # score log and sends us the recovered scores when we connect
+        backplane = BackplaneClient(BROKER_PATH, handle_backplane_message)
+        tasks.append(asyncio.create_task(backplane.run()))
+    elif SCORE_LOG_DIR:
+        # Pick up where the last run left off
+        score_log = ScoreLog(SCORE_LOG_DIR)
+        for room_name, players in score_log.recover().items():
+            room = get_room(room_name)
+            if room is not None:
+                room.scores.update(players)
+        for room_name, player_id, score, timestamp in score_log.finals:
+            record_final(room_name, player_id, score, timestamp)
+        tasks.append(asyncio.create_task(score_log.run()))
     
     # Start TCP server in the background
-    tcp_task = asyncio.create_task(handle_tcp_connections(app.websockets))
+    tasks.append(asyncio.create_task(handle_tcp_connections()))
+    tasks.append(asyncio.create_task(sweep_idle_rooms()))
+    tasks.append(asyncio.create_task(monitor_event_loop_lag()))
     
     yield
     
     # Cleanup on shutdown
-    tcp_task.cancel()
-    try:
-        await tcp_task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    for room in rooms.values():
+        room.broadcaster.close()
+    if score_log is not None:
+        score_log.close()
 
 app = FastAPI(lifespan=lifespan)
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(websocket: WebSocket, room: str = DEFAULT_ROOM):
+    # Viewers subscribe to one room with /ws?room=<name>. Until the match
+    # sends its first score the room doesn't exist, the page keeps retrying.
+    room = find_room(room)
+    if room is None:
+        await websocket.close(code=1008)
+        return
+
     await websocket.accept()
-    app.websockets.add(websocket)
+    broadcaster = room.broadcaster
+    broadcaster.add(websocket)
     
     try:
         while True:
             message = await websocket.receive_text()
             if message == "reset":
                 # Broadcast reset command to all clients
-                for ws in app.websockets:
-                    await ws.send_text("reset_acknowledged")
-    except WebSocketDisconnect:
-        app.websockets.remove(websocket)
+                broadcaster.publish_text("reset_acknowledged")
+                if backplane is not None:
+                    backplane.publish(f"!reset:{room.name}")
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        broadcaster.remove(websocket)
+
+def leaderboard_page(board, offset, limit):
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), MAX_LEADERBOARD_PAGE_SIZE)
+    leaderboard = leaderboards.get(board)
+    return {
+        "board": board,
+        "total": len(leaderboard) if leaderboard is not None else 0,
+        "offset": offset,
+        "entries": leaderboard.page(offset, limit) if leaderboard is not None else [],
+    }
+
+@app.get("/leaderboard")
+async def get_leaderboard(board: str = Leaderboards.ALL_TIME, offset: int = 0, limit: int = LEADERBOARD_PAGE_SIZE):
+    # board is "all" or a day like "2024-11-30"
+    return leaderboard_page(board, offset, limit)
+
+@app.get("/leaderboard/rank")
+async def get_leaderboard_rank(player_id: str, room: str = DEFAULT_ROOM, board: str = Leaderboards.ALL_TIME):
+    leaderboard = leaderboards.get(board)
+    entry = leaderboard.rank(room, player_id) if leaderboard is not None else None
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No finished games for this player")
+    return entry
+
+@app.websocket("/ws/leaderboard")
+async def leaderboard_websocket(websocket: WebSocket, board: str = Leaderboards.ALL_TIME):
+    # Pushes the top page whenever a game finishes, other pages are
+    # requested by sending {"offset": 20, "limit": 10}
+    # Only boards that exist get a broadcaster, "all" always does and a
+    # day once its first game finished
+    if leaderboards.get(board) is None:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    broadcaster = leaderboard_broadcasters.get(board)
+    if broadcaster is None:
+        broadcaster = leaderboard_broadcasters[board] = Broadcaster(None)
+    viewer = broadcaster.add(websocket)
+    viewer.offer("text", None, encode_frame(leaderboard_page(board, 0, LEADERBOARD_PAGE_SIZE)))
+
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                request = json.loads(message)
+                page = leaderboard_page(board, int(request.get("offset", 0)), int(request.get("limit", LEADERBOARD_PAGE_SIZE)))
+            except (ValueError, TypeError, AttributeError):
+                continue
+            viewer.offer("text", None, encode_frame(page))
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        broadcaster.remove(websocket)
+        if not len(broadcaster) and leaderboard_broadcasters.get(board) is broadcaster:
+            broadcaster.close()
+            del leaderboard_broadcasters[board]
 
 html = """
 <!DOCTYPE html>
@@ -132,7 +588,7 @@ html = """
             align-items: center;
       }
 
-      .logo svg {
+      .logo img {
         width: 100%;
         height: 100%;
         }
@@ -215,533 +671,7 @@ html = """
 <body>
     <div class="container">
         <div class="logo">
-        <svg
-          version="1.1"
-          viewBox="0 0 1600 1441"
-          width="526"
-          height="474"
-          xmlns="http://www.w3.org/2000/svg"
-        >
-          <path
-            transform="translate(675,325)"
-            d="m0 0h53l258 1 13 2 4 5 6 19v12l-6 10-12 12-11 9-12 11-11 9-14 11-15 13-16 12-6 4-6 1-23 1-88 1-1 1-1 11v80l10-4 30-15 20-8 20-6 31-6 21-3 21-1h22l20 1 29 4 30 7 16 5 27 11 17 8 20 12 16 12 11 8 10 10 8 7 10 10 7 8 9 10 13 18 11 16 12 23 9 20 7 19 6 25 5 25 3 33v26l-2 20-5 14-6 12-11 12-9 8-10 6-17 5-15 1-13-1-15-4-11-6-12-10-7-8-7-10-6-15-2-10-2-32-3-25-4-18-6-15-8-17-8-13-6-9-10-11-9-11-10-7-15-10-16-9-21-7-16-4-16-2h-25l-20 3-24 7-12 5-17 11-13 10-9 8-9 11-12 15-8 14-8 20-5 18-2 15v28l2 19 5 19 8 21 8 14 11 14 11 12 8 8 19 14 15 9 10 5 26 10 19 6 16 4 15 6 9 6 11 12 8 12 6 17 1 8v15l-2 14-5 12-9 13-13 13-13 8-10 4-12 2h-20l-22-3-25-6-24-8-22-9-16-8-19-11-14-10-10-8-13-10-13-12-8-7-6 1-14 10-7 4-6 2h-26l-10-5-22-16-13-10-15-10-12-7-6-5-4-10-1-8-1-54v-171l1-15 3-9 4-6 11-8 13-10 7-5 1-6-12-8-14-9-8-6-4-5-1-5-1-186-1-5-65 1h-34l-15-1-7-3-16-12-14-12-13-12-11-9-12-11-13-10-16-15-4-7-2-5v-7l5-18 6-8 5-2z"
-            fill="#C01011"
-          />
-          <path
-            transform="translate(675,325)"
-            d="m0 0h53l258 1 13 2 4 5 6 19v12l-6 10-12 12-11 9-12 11-11 9-14 11-15 13-16 12-6 4-6 1-23 1-88 1-1 1-1 11v80l10-4 30-15 20-8 20-6 31-6 21-3 21-1h22l20 1 29 4 30 7 16 5 27 11 17 8 20 12 16 12 11 8 10 10 8 7 10 10 7 8 9 10 13 18 11 16 12 23 9 20 7 19 6 25 5 25 3 33v26l-2 20-5 14-6 12-11 12-9 8-10 6-17 5-15 1-13-1-15-4-11-6-12-10-7-8-7-10-6-15-2-10-2-32-3-25-4-18-6-15-8-17-8-13-6-9-10-11-9-11-10-7-15-10-16-9-21-7-16-4-16-2h-25l-20 3-24 7-12 5-17 11-13 10-9 8-7 8h-6l2-7 1-2-2-1-2-4v-8l-6 1-1-4h-3l-3-5-2-5-4-4-4-16-3-5v-2l-5-1-7-11v-5l-5-3-1-2-5-3h-10l-6-3-4-13-2-7-1-15-1-7-2-4-2-1v-5l-2-1 1-2h-2l-1 8-3 3h-2l-2-10v-15h-2v-27l-1-4-2 1-4-16-1-3-3-2 1-3h-9l-9-6 1-4h-3l-3-4-1-10-1-7-5-4v-6l-5-1v-2h-2l-1 2-1-2 2-5h-11l-10-7-3-2h2v-2l-11-1-9-5-11-8-3-5-5-4-4-9-3-6 1-8-6-15-2-6-2-9-3-2-7-2-5-4-1-6h2v-5l3-2-3-2 1-1-47-1v-1z"
-            fill="#A40C1B"
-          />
-          <path
-            transform="translate(940,507)"
-            d="m0 0h22l20 1 29 4 30 7 16 5 27 11 17 8 20 12 16 12 11 8 10 10 8 7 10 10 7 8 9 10 13 18 11 16 12 23 9 20 7 19 6 25 5 25 3 33v26l-2 20-5 14-6 12-11 12-9 8-10 6-17 5-15 1-13-1-15-4-11-6-12-10-7-8-7-10-6-15-2-10-2-32-3-25-4-18-6-15-8-17-8-13-6-9-10-11-9-11-10-7-15-10-16-9-21-7-16-4-16-2h-25l-20 3-24 7-12 5-17 11-13 10-9 8-7 8-9 11-12 15-8 14-8 20-5 18-2 15v28l2 19 5 19 8 21 8 14 11 14 11 12 8 8 19 14 15 9 10 5 26 10 19 6 16 4 15 6 9 6 11 12 8 12 6 17 1 8v15l-2 14-5 12-9 13-13 13-13 8-10 4-12 2h-20l-22-3-25-6-24-8-22-9-16-8-5-3v-3l-2-4 7-1v-4h2l1-3h2v-4h2l1-11 3-8 4-12 6-7 5-9 8-11 3-5 5-5 7-11 3-4 4-6 7-7 2-4 7-3 10-1z"
-            fill="#161E86"
-          />
-          <path
-            transform="translate(591,740)"
-            d="m0 0h1l1 130 1 22 2-2 4 2 1 9 2 7 2 3 3-1 4-8 8-7 5-2 5 4 4-2h11l10-6 3-5 4-1v2l4 1-1 2-3 4h5l-1 3h10v2l5-2 1 2-3 5 7-1 1 2 3-1 1 2 5-3v2h11l-1 3 4-2 19-11h-4v-2l4-2 2-6 3-4-1-4 5-1 1 3 9-1h7l5 1v-2l-2-1 3-5h-2l-1-8h2l2-7 3-2h2l1 5h2v-3h2l1-20h1l1 10 2-19h1l1 19 2 13 1 1 1-9 1-37 1-13h1l1-10 4 2 2-11 3-2v36l2 19 5 19 8 21 8 14 11 14 11 12 8 8 19 14 15 9 10 5 26 10 19 6 16 4 15 6 9 6 11 12 8 12 6 17 1 8v15l-2 14-5 12-9 13-13 13-13 8-10 4-12 2h-20l-22-3-25-6-24-8-22-9-16-8-19-11-14-10-10-8-13-10-13-12-8-7-6 1-14 10-7 4-6 2h-26l-10-5-22-16-13-10-15-10-12-7-6-5-4-10-1-8-1-54z"
-            fill="#880A3D"
-          />
-          <path
-            transform="translate(970,775)"
-            d="m0 0h19l15 3 12 5 9 7 15 16 12 13 8 10 11 11 9 11 14 14 7 8 13 15 13 14 9 11 11 12 9 11 18 18 10 13 8 15 3 12v21l-3 12-8 16-9 12-9 9-16 8-11 4-12 2h-13l-14-3-18-8-10-9-12-12-7-8-9-10-7-8-15-16-5-6-8-7-9-11-12-12-9-11-16-17-11-13-9-9-7-8-6-7v-2l-4-2-10-12-4-8-3-7-3-13v-20l3-14 4-12 7-10 9-10 9-8 13-6 12-3z"
-            fill="#1D0D8F"
-          />
-          <path
-            transform="translate(1178,648)"
-            d="m0 0 5 2v2l3-2 7-1 7 3 4 5v2l4 2 4 5 8 13 3 6v3l3 1v4h2l2 6 4-1 2 4 1 4 3-1 6 18 8 38 3 24 1 14v26l-2 20-5 14-6 12-11 12-9 8-10 6-17 5-15 1-13-1-15-4-11-6-12-10-7-8-7-10-6-15-2-10-2-32-3-25-3-14-1-10-5-10-2-10-2-5-6-7-1-4-2-16-2-7 1-6 2-1-1-3 2-2 4 2 11-3 3 2h2l1 2h8 3l4 2 4-1 11-5 2-2 2-7 3-4 2-6 5-2v-5l10 1 3 1-2-5 6-1h8l2-7z"
-            fill="#1D0D8F"
-          />
-          <path
-            transform="translate(734,326)"
-            d="m0 0h252l13 2 4 5 6 19v12l-6 10-12 12-11 9-12 11-11 9-14 11-15 13-16 12-6 4-6 1-23 1h-89l1-3-4-4-3-8-3-7-1-2v-12l-1-2v-13l-2-4-5-1v-6l-5-5-2-4 2-6v-8l-4-7-1-6v-8l4-6v-11l2-1-2-4-30-2z"
-            fill="#691046"
-          />
-          <path
-            transform="translate(894,950)"
-            d="m0 0 10 3 15 6 19 6 16 4 15 6 9 6 11 12 8 12 6 17 1 8v15l-2 14-5 12-9 13-13 13-13 8-10 4-12 2h-20l-22-3-25-6-24-8-22-9-16-8-5-3v-3l-2-4 7-1v-4h2l1-3h2v-4h2l1-11 3-8 4-12 6-7 5-9 8-11 3-5 5-5 7-11 3-4 4-6 7-7 2-4 7-3 10-1z"
-            fill="#1D0D8F"
-          />
-          <path
-            transform="translate(794,758)"
-            d="m0 0 1 3 2 1v2h2l-2 12-3 4-2 11h-3l-1-1-1 10h-1l-1 12-1 42-1 5-3-2-3-19-2 13-3 3h-2v3l-3 1v-6l-4 3v2h-2l-1 4h-2l1 8h2l-2 5 1 3h-17l-7 1 2-1-5-2 2 5h-2l-4 10-4 1v2l5-1-3 3-17 10-2 2-3-1 1-2h-11l-1-1-5 2v-2l-3 1-1-2-4 1-2-1 2-6-5 1-1 2v-3l-9-1v-2l-4-1 2-5 1-1-3-1v-2l-5 3-3 5-9 5h-11l-4 2-5-4-5 2-6 6h-2l-2 6-3 4-4-2-2-4-1-9v-3l-2-1-1-1h-2l-2 2-1-24v-24l2 2 1-16 5-11h7l1-5 2-7 1-7 3-2 1 4 1-12 3-3 3 1 2 7v11l3 8 5-1-1-3 1-5v-9l1 3 1-2 2-7 1-2 1-6 2 3v5h2l2 4 3 1 2-2 1-10v-5l2-3h6l3 3 2 4 5-1h7l1 3 3-6 6-2 1-2h3v2l5 2 4-1 2 13 1 4 5 2 2 5 6-3h2l2-8 3-4 2 2 4-11 5 1 2 16h1l2-9 2-1 1-7 3-2 2 4 2-2 3 3 1 6 1 1 3 40 2-7 2-32 2-7 1-3 3-1 1-5h2l1 2h3v2h2v-3l6-1 4 2 1-5 6-11z"
-            fill="#880A28"
-          />
-          <path
-            transform="translate(825,900)"
-            d="m0 0 5 1 11 12 8 8 19 14 15 9 11 6-1 2-10 1-7 2-2 5-8 8-3 6-5 6-4 7-4 5-3 2-5 9-5 6-6 11-3 1-3 10-3 6-2 8-1 8-1 2h-2v4h-2l-1 4-2-1v4l-6 2 3 5-6-1-16-10-17-13-14-11-13-12-8-7-6 1-5 3h-4v-16l1-1v-9l3-7 2-6 3-7 6-11 3-3 4-6 4-1 1-4 4-1 2-4 8-6 4-4 13-10h2l2-4 3-3h2v-3l5-3h2l1-3 11-6 13-4z"
-            fill="#5D085A"
-          />
-          <path
-            transform="translate(940,507)"
-            d="m0 0h22l20 1 29 4 30 7-1 2-14 3-5 5-1 4h-3l-2 9-3 7-5 8-6 11-4 7v10l-3 7-3 5-3 3-1 5-1 3v7l1 4-1 8v17h-2l1 3h-4v2h-2v2l-19-2h-34l-2-12-3-17-2-4-3-30v-17l-1-3v-10l-2-12-2-7v-10l-1-13 2-3 7-3z"
-            fill="#4C245D"
-          />
-          <path
-            transform="translate(784,460)"
-            d="m0 0 1 2h2v88l10-4 30-15 20-8 20-6 31-6 13-2h5l-1 2h-3l-1 8 1 9v9l3 10 1 9v11l1 4v16l3 29 2 4 3 17 1 3v9l2 1-16 3-21 6-12 5-11 7-2-1 2-5 2-1 2-6-3-1-3-5v-5h-2l-3-9-4-6-6-23-2-3-1-8-4-8-1-6-3-7-5-24-3-9-5-3h-8l-1 3-6 1h-3l-4-1v2l-8 3v6l-10-3-2-5-1-39z"
-            fill="#7D0B2D"
-          />
-          <path
-            transform="translate(384,326)"
-            d="m0 0h65l10 1 7 4h3v7h-2v2h-4l1 4 7 1 19 5 6 3 2 2-1 6-1 5 2 5 7 13-1 19-1 9 2 1h-2v2h-2l-2 5h-5l-1 3-3 1-3 3-2 1h-10l-12-3-8 1-5-3h-4l1 7-1 3h2l1-2 1 5h2l2 6-8-6-20-18-11-9-12-11-13-10-16-15-4-7-2-5v-7l5-18 6-8z"
-            fill="#D4120F"
-          />
-          <path
-            transform="translate(906,328)"
-            d="m0 0h93l4 5 6 19v12l-6 10-12 12-11 9-12 11-11 9-14 11-15 13-15 11-6 1-5 1 1-3-2-1v-4l2-13-1-2-4 1-6-7v-2l-3-1-4-9 1-10 5-6-6-2-2-6 1-7 5-14 4-10 3-4 2-8h2l-1-12 4-1v-2z"
-            fill="#530945"
-          />
-          <path
-            transform="translate(705,327)"
-            d="m0 0h39l20 1 1 4 2 1-3 1 1 12-4 5v8l2 7 3 6v8l-2 7 4 6 3 2-1 6 5 1 3 4v14l1 5v8l3 5 3 9v3l4 2 1 3-3 7h-2v54l1 31 1 4 7 2 6 3-2 1 1 4-2 12-1 3h-2l-1 2-3-3-1-3-2-1v-4l-3 1v-24h-2l-1 9h-2l-2-16 2-4v-5l-2-2-1-5v-8l1-5-1-9-2-8-4-9-3-7-4-8-6-8-6-4-8-10-1-2-7-4v-2h-2l-4-4-4-3v-2l-5-2-6-5-5-5-5-3v-2l-3-1-4-4-6-3-4-5-2-5-2-6v-6l-1-3 1-9 3-7 4-10v-8l2-1 1-5h-2l1-6 3-1-2-3z"
-            fill="#920E23"
-          />
-          <path
-            transform="translate(808,882)"
-            d="m0 0 7 2 1 2 5 3 7 10-3 2-11 2-10 4-10 5-3 3-5 2v3l-4 1-2 4-3 3-9 7-5 4h-2l-2 4-8 6-3 3h-2l-1 4-5 3-4 7h-2l-2 5-3 6-6 14-1 6h-2l1 9-1 4-1 13 3 1-12 9-9 3-15-1-11-5v-2h-3l1-3-3-8 1-5 1-7-1-5 3-6 1-1 1-8 3-1 1-5 5-6 2-9h2l1-4h2v-3h2l1-4 5-7 5-3 4-7h2l2-5 5-5 2-4 8-4 7-3 3-5 6-5h3l2-5 5-1 1-5 8-4 9 1 1-2 2 1 6-3h16z"
-            fill="#6A0F45"
-          />
-          <path
-            transform="translate(734,326)"
-            d="m0 0h76l47 1v1l-19 1-6 4-3 3 1 5-4 10-3 8v15l2 3-1 7-1 3 1 2-1 4 2 9 2 3v10l4 2 2 6 3 5 1 5 3 7v5h-2v7l-5 3h28l4 2h-77l1-3-4-4-3-8-3-7-1-2v-12l-1-2v-13l-2-4-5-1v-6l-5-5-2-4 2-6v-8l-4-7-1-6v-8l4-6v-11l2-1-2-4-30-2z"
-            fill="#730A2F"
-          />
-          <path
-            transform="translate(795,778)"
-            d="m0 0h1v36l2 19 5 19 8 21 7 12v2l-3-1v-2l-7-1-11 5h-16l-7 3h-2l-6 1-3-1-6 3h-2l-1 5-4 1-3 5-5 3-5 4-2 5-7 2-6 3h-2l-1 4-5 5-3 5h-2l-2 5-9 9-4 7h-2v3l-2 1-1 3h-2l-1 9-6 7v5h-4v8l-3 4-1 6 1 6-1 5h-2l4 11-1 2-1 1h3v2l5 1 6 3 13 1v1h-24l-10-5-22-16-6-5-2-6h2v-2h2l1-4-2-3h3v-4h3l1-4 6-3 1-7 5-8 8-10h3l2-7 1-7 3-1 3-13 2-7h2l1-2h2l2-4 4-4h2l2-10 13-1-1 3 4-2 19-11h-4v-2l4-2 2-6 3-4-1-4 5-1 1 3 9-1h7l5 1v-2l-2-1 3-5h-2l-1-8h2l2-7 3-2h2l1 5h2v-3h2l1-20h1l1 10 2-19h1l1 19 2 13 1 1 1-9 1-37 1-13h1l1-10 4 2 2-11z"
-            fill="#7B0741"
-          />
-          <path
-            transform="translate(686,776)"
-            d="m0 0h3v2l5 2 4-1 2 13 1 4 5 2 2 5 6-3h2l2-8 3-4 2 2 4-11 5 1 1 4v11l-2-2-4 1-3 16-2 1-1-2-2 4-1 20-2 2-1-21-1-4-1 1-1 14v9l-4 1-1-5h-2l-1-7-4 1-3-3-3-8-3-2-3 1v-2l-4 1-3 9-2 9-4 1-1-4-7 3-2-3-4 5-3 9-4 5h-6l-2 4-4 6-1 4-7 6-8 8h-3l-2 5-5 5h-3v2l-6 3-7 7-3-3h-2l-2 2-1-24v-24l2 2 1-16 5-11h7l1-5 2-7 1-7 3-2 1 4 1-12 3-3 3 1 2 7v11l3 8 5-1-1-3 1-5v-9l1 3 1-2 2-7 1-2 1-6 2 3v5h2l2 4 3 1 2-2 1-10v-5l2-3h6l3 3 2 4 5-1h7l1 3 3-6 6-2 1-2h3v2l5 2 4-1 2 13 1 4 5 2 2 5 6-3h2l2-8 3-4 2 2 4-11 5 1 2 16h1l2-9 2-1 1-7 3-2 2 4 2-2 3 3 1 6 1 1 3 40 2-7 2-32 2-7 1-3 3-1 1-5h2l1 2h3v2h2v-3l6-1 4 2 1-5 6-11z"
-            fill="#A50C1B"
-          />
-          <path
-            transform="translate(1040,520)"
-            d="m0 0 8 1 17 6 26 11 19 10 6 4-1 2-9-1-10-5-5-2-4-1-9 2-8 8-6 9-4 5-2 4-3 3-4 10-7 14h-2l-1 4-8 2v2l-7 3-4 3-3 2v3l-2 12-3 7-1 12-3 10-11-3-18-5-2-1v-2h2v-2l3-1v-2h2l-1-8v-12l1-6-1-3v-7l2-5 1-5 3-3 3-4 2-7v-9l7-12 3-6 3-4 4-7 3-8-2-1 2-1 1-3h3l1-5 3-1 2-4z"
-            fill="#1D0D8F"
-          />
-          <path
-            transform="translate(859,931)"
-            d="m0 0 5 1 17 11 13 7-1 2-10 1-7 2-2 5-8 8-3 6-5 6-4 7-4 5-3 2-5 9-5 6-6 11-3 1-3 10-3 6-2 8-1 8-1 2h-2v4h-2l-1 4-2-1v4l-6 2 3 5-6-1-16-10-17-13-1-4 6-2 6-11 2-1 5-18 5-10 5-4 3-3 4-2 8-11 4-8 9-8 5-5 2-3h2l3-9 3-4h2l2-6 10-8z"
-            fill="#3C0777"
-          />
-          <path
-            transform="translate(735,328)"
-            d="m0 0h29l1 4 2 1-3 1 1 12-4 5v8l2 7 3 6v8l-2 7 4 6 3 2-1 6 5 1 3 4v14l1 5v8l3 5 3 9v3l4 2 1 3-3 7h-7l-14-14-9-6v-2l-5-2v-3l-2-1v-3l-4-2-3-3v-2h-2l-1-2-5-3-8-11-6-8-4-7v-3l1-4 2-4-2-2v-7l2-3v-6h3l-1-7 1-6 3-2v-4h2v-11l2-3h2l1-2z"
-            fill="#870A28"
-          />
-          <path
-            transform="translate(840,924)"
-            d="m0 0h13l8 6-2 2-7 2-6 6h-2l-1 4-1 2h-2l-2 4-4 9h-2l-2 4-4 2-2 4-7 6-5 9-8 11-6 2-2 4-4 3-5 12-4 15-3 2-6 12h-6l-1 2-12-9-6-5v-7l4-9h2l-1-5 4-4 5-15 2-5 6-8 2-2 2-1 3-9 8-9 9-6 7-6 5-3 8-5 5-7 4-2h4v-2z"
-            fill="#4A0662"
-          />
-          <path
-            transform="translate(858,327)"
-            d="m0 0 9 1v2h-3l-2 5v9l-2 8-4 7h2l1 7-2 6 1 13-2 5 2 5v8l3 4v11l4 5 1 5 4 1 4 8-1 8 1 2h-6l-1 2h-4l-1 3h-24l-1-4 1-3h2l-3-10-2-4-1-4-3-5-2-6-2-1-1-10-2-5-2-8 1-4-1-2 2-5-1-5-1-6v-11l4-10 3-9-1-4 8-7 2-1z"
-            fill="#650838"
-          />
-          <path
-            transform="translate(999,511)"
-            d="m0 0 12 1 30 7-1 2-14 3-5 5-1 4h-3l-2 9-3 7-5 8-6 11-4 7v10l-3 7-3 5-3 3-1 5-1 3v7l1 4-1 8v17h-2l1 3h-4v2h-2v2l-19-2h-34l-2-12-3-17-2-4-3-30v-17l-1-3v-10l-2-12-2-7v-10l-1-13 2-3 7-3z"
-            fill="#3D2465"
-          />
-          <path
-            transform="translate(911,509)"
-            d="m0 0h5l-1 2h-3l-1 8 1 9v9l3 10 1 9v11l1 4v16l3 29 2 4 3 17 1 3v9l2 1-14 2v-2l-6-1-4-2-3-6-7-26-1-17-4-14-2-12-2-2-1-10-2-10-1-12 1-7v-10h-2l-1-4h-2v-2l21-4z"
-            fill="#6A0F45"
-          />
-          <path
-            transform="translate(940,507)"
-            fill="#650838"
-          />
-          <path
-            transform="translate(999,511)"
-            d="m0 0 12 1 30 7-1 2-14 3-5 5-1 4h-3l-2 9-3 7-5 8-6 11-4 7v10l-3 7-3 5-3 3-1 5-1 3v7l1 4-1 8v17h-2l1 3h-4v2h-2v2l-19-2h-34l-2-12-3-17-2-4-3-30v-17l-1-3v-10l-2-12-2-7v-10l-1-13 2-3 7-3z"
-            fill="#3D2465"
-          />
-          <path
-            transform="translate(911,509)"
-            d="m0 0h5l-1 2h-3l-1 8 1 9v9l3 10 1 9v11l1 4v16l3 29 2 4 3 17 1 3v9l2 1-14 2v-2l-6-1-4-2-3-6-7-26-1-17-4-14-2-12-2-2-1-10-2-10-1-12 1-7v-10h-2l-1-4h-2v-2l21-4z"
-            fill="#6A0F45"
-          />
-          <path
-            transform="translate(940,507)"
-            d="m0 0h22v1l-14 1 1 4-3 2-1 7-4 6 1 6-1 5v11l1 2v16l1 1v13l-1 8 2 15 1 13 2 6v10l-1 6-2 2-2 5h15v1l-31 1-2-12-3-17-2-4-3-30v-17l-1-3v-10l-2-12-2-7v-10l-1-13 2-3 7-3z"
-            fill="#591D54"
-          />
-          <path
-            transform="translate(686,810)"
-            d="m0 0h2v2l4-2v2l4 2 2 9h6l1-4v11h2l4 10-1 11-3 7-2-3v-2h-3l-2 6-5 1-2-4-3 1-2-1v2h-2l-2 4-7 1h-9l-5 6-2 4-2 11-5 7-9 5h-11l-4 2-5-4-5 2-6 6h-2l-2 6-3 4-4-2-2-4-1-11 3-7h3l4-3h3v-2l5-3 4-5 1-2h3l1-3 5-3 7-8h2l1-6 6-8 7-2 4-7 2-6 4-5 2 3 7-2 1 4 3-1 3-13 3-5z"
-            fill="#920D22"
-          />
-          <path
-            transform="translate(687,616)"
-            d="m0 0 4 5 4-1 3 1v9h2l2 3 2 1v2l4 1 1 2 2 2-1 2 4 1-3 1-1 6-7 1-4 6-5 1v10h3l1 9 3 10v-7l-2-4 1-8 6-6 3 1 2-3 6-1 8 13 1 14h3l2 4h7l5 5 3 8v7l-5 8-4 2-6 7-2 2-5 2h-4l-2-4-2-5-3-7-3 1-2-10-3-1-1-5-2 4 6 15v6l-5-3-5-10-2-2-8-29-1-4-2-1 1-4-2-4-1-5v-3-2l3-3v-3h3v-5h-2v-4l4-7-1-5-3 1-3 6h-2l-1 5-2 1v-7l-3 3v-11l1 3h2v-6l5-5h2z"
-            fill="#D4120F"
-          />
-          <path
-            transform="translate(872,516)"
-            d="m0 0 7 1 1 4h2l1 10-1 8 1 14 2 9 1 8 2 2 3 15 3 11 1 17 7 26 2 6 10 3v2l-24 7-2-5-4-4-3-12-5-12-4-9-3-6-3-17-2-17v-18l-4-16-2-6-1-9 2-4-8 1 2-4z"
-            fill="#730A30"
-          />
-          <path
-            transform="translate(824,540)"
-            d="m0 0 6 1 4 5 4 16 3 15 4 11 3 9 1 1 2 10 3 8 5 18 4 6 1 7h2l2 6 2 4 2 1-2 7-5 8-16 12-1-3 2-4 1-9-2-9-4-10-2-7-6-8-6-12-6-9 1-18-2-2-2-7-2-2-1-12-6-9-7-1-2-2v-6l-2-1h2v-3l2-1 2-5 4-1 6-1 1-2z"
-            fill="#910D23"
-          />
-          <path
-            transform="translate(734,326)"
-            d="m0 0h76v1h-6l-1 2-11 5-4 13-1 7v10l-2 4 2 7v7l-1 5 5 11 2 13 1 8 5 11 4 11v6l4 4-6 2 5 1v1h55l4 2h-77l1-3-4-4-3-8-3-7-1-2v-12l-1-2v-13l-2-4-5-1v-6l-5-5-2-4 2-6v-8l-4-7-1-6v-8l4-6v-11l2-1-2-4-30-2z"
-            fill="#7D0A2D"
-          />
-          <path
-            transform="translate(731,787)"
-            d="m0 0h1l1 8 1 1-1 11h-1v61l-9 3h-12v2l-5 3-8 6-2 3-8 2-11 8h-11v-2l-4-1 2-5 1-1-3-1v-2l-3 1 1-11 5-8 3-3h14l4-4h2v-2h5l2 3h5l2-6h3l2 2 2-4 1-12-1-4 2-1v-16l1-7 3-4 1 7 1 16 1-19h2l1-5 2 4 3-16 4-1z"
-            fill="#880A28"
-          />
-          <path
-            transform="translate(794,758)"
-            d="m0 0 1 3 2 1v2h2l-2 12-3 4-2 11h-3l-1-1-1 10h-1l-1 12-1 42-1 5-3-2-3-19-2 13-3 3h-2v-3l-2-1v-2l-1-3v-44l-1-9-3 6-2 11-3 39-3 4-2-2-2-1-2 2v5h-2l-2 2-1-3v-16l2-11 2-4v-7h-2l-3-21-1 3h-2v8l-2-1-1-4-2 12h-1v-11l3-16 2-1 1-7 3-2 2 4 2-2 3 3 1 6 1 1 3 40 2-7 2-32 2-7 1-3 3-1 1-5h2l1 2h3v2h2v-3l6-1 4 2 1-5 6-11z"
-            fill="#900D23"
-          />
-          <path
-            transform="translate(795,778)"
-            d="m0 0h1v36l2 19 5 19 6 16-1 2-10 2-2 1-8-2-1-2-3-1-1 4-1 2h-6l-8-5-4 1-2 1v-2h-3l-1-8h2l2-7 3-2h2l1 5h2v-3h2l1-20h1l1 10 2-19h1l1 19 2 13 1 1 1-9 1-37 1-13h1l1-10 4 2 2-11z"
-            fill="#880A3D"
-          />
-          <path
-            transform="translate(597,581)"
-            d="m0 0h3l3 6 3-3 1 5 5 1 4 4 3 7 5 3 5 10 5 16v7l3 1 1 10-1-2-4 4 1 1 5-1-1 7 3 6v2l5 1 2 6-1 2h2v6h2l1-3 5 4h2l-1 4-2 4-4 3-2 11h-3l1-6 1-2h-2l-1-5-5-5-3-10-9-9-7-3 1-5 1-2h4v-5l-2-4-2-7 1-1v-8l-1 3h-2l-7-12-1-7h-6v6l-1 2h-2v2h-2l-1-3-2-16-1-7h-2z"
-            fill="#D4120F"
-          />
-          <path
-            transform="translate(751,863)"
-            d="m0 0 1 2 6-1 1 5h2l-2 5 1 3h-17l-7 1 2-1-5-2 2 5h-2l-4 10-4 1v2l5-1-3 3-17 10-2 2-3-1 1-2h-11l-1-1-5 2v-2l-3 1-1-2-4 1-2-1 2-6-5 1-1 2v-3l13-10 8-2 5-6 5-3 2-2h3v-2l12-1 8-1 2 3h3l2-2-2-2 2-1h6 3v-2z"
-            fill="#7D0A2D"
-          />
-          <path
-            transform="translate(742,777)"
-            d="m0 0 3 4 2-2 3 3 1 6 1 1 3 40 2-7h1v26l-3 4-2-2-2-1-2 2v5h-2l-2 2-1-3v-16l2-11 2-4v-7h-2l-3-21-1 3h-2v8l-2-1-1-4-2 12h-1v-11l3-16 2-1 1-7z"
-            fill="#920D22"
-          />
-          <path
-            transform="translate(795,778)"
-            d="m0 0h1v36l2 19 1 6-3 1-4 8-5 2v8l-2 3-3-1 1-13 1-35 1-13h1l1-10 4 2 2-11z"
-            fill="#660837"
-          />
-          <path
-            transform="translate(731,787)"
-            d="m0 0h1l1 8 1 1-1 11h-1l-1 41-2 1v-4h-2l-1 4-5-1-3 3-2-1v-15l1-5 1-19h2l1-5 2 4 3-16 4-1z"
-            fill="#910D23"
-          />
-          <path
-            transform="translate(794,758)"
-            d="m0 0 1 3 2 1v2h2l-2 12-2 2-2-1-2 6-3-2-3 3-1 10-2 2-2-9-1 5h-2l1 3-2 1-1-2h-3l-2-6-1 4-2-8-2 4-2 2-1 7-1 1-1 7h-1v-15l2-7 1-3 3-1 1-5h2l1 2h3v2h2v-3l6-1 4 2 1-5 6-11z"
-            fill="#A40C1B"
-          />
-          <path
-            transform="translate(731,801)"
-            d="m0 0h3l1 4 2-4h1l2 12-1 20-1 7-1-4h-2v8h2l2 4 1 11 3 2-3 1 3 2v3l-5 1v3l-3 3-4-2z"
-            fill="#84093B"
-          />
-          <path
-            transform="translate(793,777)"
-            d="m0 0h2l-3 14h-3l-1-1-1 10h-1l-1 12-1 42-1 5-3-2-2-15-1-19 1-3 1-24 2-2 2 14v-17l2-10 3-1 3 2z"
-            fill="#820A2A"
-          />
-          <path
-            transform="translate(782,525)"
-            d="m0 0 2 3 1 4 1 15 1 4 7 2 6 3-2 1 1 4-2 12-1 3h-2l-1 2-3-3-1-3-2-1v-4l-3 1v-24h-2l-1 9h-2l-2-16 3-1z"
-            fill="#920D22"
-          />
-          <path
-            transform="translate(515,373)"
-            d="m0 0h5l2 8 5 6v7l-1 9 1 11v5l1 2-4 9-6 7-8 3h-8l-1-3 14-3 2-1 2-4 2-3 2-10-1-8-2-5 1-8-5-3-1-2 2-4 2 1-1-6-3-6z"
-            fill="#D4120F"
-          />
-          <path
-            transform="translate(714,807)"
-            d="m0 0h1l1 7 1 36 1 8-2 4h-2v5l-4 2-3-5v-9l2-4 1-12-1-4 2-1v-16l1-7z"
-            fill="#890A3D"
-          />
-          <path
-            transform="translate(592,590)"
-            d="m0 0h1l3 20h2l2 9-1 17h-3l-2 13 6-1 5 7-2 2 1 6-6-4-5-6-1-5z"
-            fill="#D2120F"
-          />
-          <path
-            transform="translate(475,331)"
-            d="m0 0h20l4 1v2h-2v2l3 1-1 2 3-1v2h-4l1 3h-4v2l4 1 3 2-9-1-17-2-2-1v-2h-2v-2l5-2 1-3-3-2z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(743,795)"
-            d="m0 0h1l2 16v6h2l1 7-1 8-2-1-2 14h-1l-1-5-2-2-1 10-2 1v-5h-2v-8h2l1-5 1-18 1-14h2z"
-            fill="#740A2F"
-          />
-          <path
-            transform="translate(784,460)"
-            d="m0 0 1 2h2v88l10-4 30-15 20-8 5-1-1 2-10 4-13 6-14 6 6-1h3v2h-4l-1 3-6 1h-3l-4-1v2l-8 3v6l-10-3-2-5-1-39z"
-            fill="#820B3D"
-          />
-          <path
-            transform="translate(726,883)"
-            d="m0 0 5 2-2 5-4 1v2l5-1-3 3-17 10-2 2-3-1 1-2h-5l2-6 6-6 7-3 6-4z"
-            fill="#730A30"
-          />
-          <path
-            transform="translate(793,794)"
-            d="m0 0h1l1 18 1 2 1 14-3 11h-2l-1-6-2 6-2-4-2-2v-17h1l1-9 2-2 2 6 1-14z"
-            fill="#671046"
-          />
-          <path
-            transform="translate(728,523)"
-            d="m0 0h2l2 7 2-1v29h-3l-1-3-1 2h-2l-3-10v-6l1-2 2-15z"
-            fill="#A50C1B"
-          />
-          <path
-            transform="translate(742,777)"
-            d="m0 0 3 4 2-2 3 3 1 6 1 1v10l-3-2-3-7-1 8-2-2-1 3h-2v8l-2-1-1-4-2 12h-1v-11l3-16 2-1 1-7z"
-            fill="#A40C1B"
-          />
-          <path
-            transform="translate(766,791)"
-            d="m0 0h1l1 10v28l-1 13h-1l-1-5h-3v-29l1-7 2-1z"
-            fill="#610B42"
-          />
-          <path
-            transform="translate(795,778)"
-            d="m0 0h1l-1 34h-1l-1-13-1 16-4-8-3-1v-7h1l1-10 4 2 2-11z"
-            fill="#720A30"
-          />
-          <path
-            transform="translate(974,397)"
-            d="m0 0 2 2-14 12-20 16-4 3-2-1 3-4 3-1 2-4 2-3 5-3 3-1 1-3 8-6 7-4 2-2z"
-            fill="#5C1B52"
-          />
-          <path
-            transform="translate(755,785)"
-            d="m0 0h1l1 17 1 3v17l-2 7-2 1-2-26 1-3z"
-            fill="#C11110"
-          />
-          <path
-            transform="translate(613,712)"
-            d="m0 0h6l1 5-3 5-7 5-3-1v-11z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(796,828)"
-            d="m0 0h1l2 11-3 1-4 8-5 2v8l-2 3-3-1 1-13 2-3 3 1 1 1 2-4v-3h3z"
-            fill="#740A31"
-          />
-          <path
-            transform="translate(730,803)"
-            d="m0 0h1v32l-3-4-3-7 1-16 3-1z"
-            fill="#880A28"
-          />
-          <path
-            transform="translate(384,326)"
-            d="m0 0h17v1l-9 2-8 4-5 1-2 4h-2l-1 3h-2l2-7 5-6z"
-            fill="#B91015"
-          />
-          <path
-            transform="translate(764,832)"
-            d="m0 0h1l4 16 1 3v6l-3 1v-6l-4 3v2l-3-1 2-14z"
-            fill="#720930"
-          />
-          <path
-            transform="translate(782,525)"
-            d="m0 0 2 3 1 4v15l-1-3h-2l-1 9h-2l-2-16 3-1z"
-            fill="#920D22"
-          />
-          <path
-            transform="translate(784,460)"
-            d="m0 0 1 2h2l-1 85h-1l-1-39z"
-            fill="#850A38"
-          />
-          <path
-            transform="translate(752,805)"
-            d="m0 0h1l2 24 2-7h1v10l-2 10-2 1-2-6z"
-            fill="#A50C1A"
-          />
-          <path
-            transform="translate(1e3 374)"
-            d="m0 0 2 1-11 11-11 9-3 3-3-1 2-1 1-3h2l2-4 5-5 4-3h2v-2l4-2 1-2z"
-            fill="#500D5D"
-          />
-          <path
-            transform="translate(743,797)"
-            d="m0 0h1l2 14v6h2l1 7-1 8-4-2-1-9z"
-            fill="#880A3B"
-          />
-          <path
-            transform="translate(767,783)"
-            d="m0 0 2 4-3 5-3 6-2 11-2 22h-1v-26h2v-7l2-7 1-3 2-1z"
-            fill="#950D21"
-          />
-          <path
-            transform="translate(766,791)"
-            d="m0 0h1l1 10v28h-1l-1-21-1 9h-1l-1 20h-1v-29l1-7 2-1z"
-            fill="#6F0A33"
-          />
-          <path
-            transform="translate(596,648)"
-            d="m0 0h4l5 7-2 2 1 6-6-4-5-6v-4z"
-            fill="#CF1211"
-          />
-          <path
-            transform="translate(795,840)"
-            d="m0 0h1l-1 7-2 7-2 1-2 8-5 1v-3l2-3 1-8 5-2 2-5z"
-            fill="#7A0741"
-          />
-          <path
-            transform="translate(793,777)"
-            d="m0 0h2l-3 14h-3-3l-2 3-1-3 2-10 3-1 3 2z"
-            fill="#910D23"
-          />
-          <path
-            transform="translate(780,794)"
-            d="m0 0 2 4v16h-1l-1 16-2-1-1-6 1-3 1-24z"
-            fill="#870A28"
-          />
-          <path
-            transform="translate(739,786)"
-            d="m0 0h1v12l-1 8-2-4-2 12h-1v-11l3-16z"
-            fill="#A50C1B"
-          />
-          <path
-            transform="translate(795,778)"
-            d="m0 0h1l-1 34h-1l-1-21h-1v-7l2-5zm-8 11 5 2v3l-5-1z"
-            fill="#7D0A35"
-          />
-          <path
-            transform="translate(1188,976)"
-            d="m0 0 3 4 4 14v15l-2-3-1-3-2-18z"
-            fill="#442261"
-          />
-          <path
-            transform="translate(993,970)"
-            d="m0 0 3 1 4 4v2l3 1 4 6 4 4-1 3-5-5-11-12z"
-            fill="#221B7E"
-          />
-          <path
-            transform="translate(739,821)"
-            d="m0 0h1v14h2v5l-2-2-1 10-2 1v-5h-2v-8h2l1-5z"
-            fill="#7D0B2D"
-          />
-          <path
-            transform="translate(755,785)"
-            d="m0 0h1l1 17-1 13-2-2v-24z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(774,707)"
-            d="m0 0 2 2v10l4 1-2 5-3 1-2-5v-13z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(776,823)"
-            d="m0 0h1v15l-2 13h-1v-24z"
-            fill="#A30C1B"
-          />
-          <path
-            transform="translate(786,541)"
-            d="m0 0h1v9l10-4 4-1-4 4v6l-10-3-1-1z"
-            fill="#7F0B3B"
-          />
-          <path
-            transform="translate(592,730)"
-            d="m0 0 2 3 1 13-1 7-1 5h-1z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(756,718)"
-            d="m0 0 4 3v2l2 1h-2l-1 2-4-1-7 3-1-3 5-3z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(746,828)"
-            d="m0 0 2 4 1 5-1 10h-1l-1 5h-1v-21z"
-            fill="#A00C1D"
-          />
-          <path
-            transform="translate(742,785)"
-            d="m0 0h1l1 10-2 4h-2v8h-1l1-21z"
-            fill="#8E0C25"
-          />
-          <path
-            transform="translate(681,613)"
-            d="m0 0 3 1v3h-2l1 4-4 5-3-3 3-8h2z"
-            fill="#D5130F"
-          />
-          <path
-            transform="translate(1022 1e3)"
-            d="m0 0 5 2 5 5 4 6v2l-4-2-7-8-3-3z"
-            fill="#251B7B"
-          />
-          <path
-            transform="translate(909,449)"
-            d="m0 0h3l-1 3-5 3h-9v-3l10-2z"
-            fill="#5C1B52"
-          />
-          <path
-            transform="translate(932,432)"
-            d="m0 0h2v2l-14 11-3-1 5-6 4-1z"
-            fill="#5F1A51"
-          />
-          <path
-            transform="translate(784,460)"
-            d="m0 0 1 2h2l-1 24h-1z"
-            fill="#7C0B36"
-          />
-          <path
-            transform="translate(785,816)"
-            d="m0 0 3 2v12l-3 3z"
-            fill="#6A1046"
-          />
-          <path
-            transform="translate(513,356)"
-            d="m0 0h2l3 11h-3l-3-5z"
-            fill="#D4120F"
-          />
-          <path
-            transform="translate(757,871)"
-            d="m0 0 3 2v4h-12l3-3 5-2z"
-            fill="#730A30"
-          />
-          <path
-            transform="translate(746,797)"
-            d="m0 0 1 3 2 1v10l-3-1z"
-            fill="#880A27"
-          />
-          <path
-            transform="translate(821,538)"
-            d="m0 0 2 1v2h-4l-1 3-6 1h-3l1-2h3v-2l7-2z"
-            fill="#890A3D"
-          />
-          <path
-            transform="translate(746,817)"
-            d="m0 0h2l1 7-1 8-2-4z"
-            fill="#810A32"
-          />
-          <path
-            transform="translate(767,845)"
-            d="m0 0 3 4v8l-3 1z"
-            fill="#7D0A2D"
-          />
-          <path
-            transform="translate(762,846)"
-            d="m0 0 1 4 3-1-1 4-2 2v2l-3-1z"
-            fill="#7D0A2D"
-          />
-          <path
-            transform="translate(782,525)"
-            d="m0 0 2 3 1 5-1 3-4-1z"
-            fill="#A50C1B"
-          />
-        </svg>
+        <img src="{logo_url}" alt="Space event logo" />
         </div>
         <div class="scoreboard">
             <div class="score-container">
@@ -772,7 +702,9 @@ html = """
         function connectWebSocket() {
         // Get the current hostname (IP address or domain)
         const wsHost = window.location.hostname;
-        var ws = new WebSocket(`ws://${wsHost}:8000/ws`);
+        // Scoreboard for one match, e.g. /?room=cabinet-3
+        const room = new URLSearchParams(window.location.search).get("room") || "default";
+        var ws = new WebSocket(`ws://${wsHost}:8000/ws?room=${encodeURIComponent(room)}`);
             
         ws.onopen = function () {
                 console.log("WebSocket connected");
@@ -826,10 +758,103 @@ html = """
 
 """
 
+@app.get("/metrics")
+async def get_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+class StaticAsset:
+    """An in-memory asset compressed once up front and served with an ETag."""
+
+    def __init__(self, body, media_type, cache_control):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+
+        self.variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        # Only keep encodings that actually came out smaller
+        self.variants = {k: v for k, v in self.variants.items() if len(v) < len(body)}
+        self.variants["identity"] = body
+
+    def pick_encoding(self, accept_encoding):
+        accepted = set()
+        for item in accept_encoding.split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            key, _, value = params.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+            if quality > 0:
+                accepted.add(name.strip().lower())
+
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def response(self, request):
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in if_none_match or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+
+        encoding = self.pick_encoding(request.headers.get("accept-encoding", ""))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+
+# The logo URL carries its hash, so browsers can keep it for good and a new
+# logo is simply a new URL. The page itself is revalidated on every load,
+# which costs a 304 when nothing changed.
+with open(os.path.join(ASSETS_DIR, 'logo.svg'), 'rb') as f:
+    logo_asset = StaticAsset(f.read(), "image/svg+xml", "public, max-age=31536000, immutable")
+page_asset = StaticAsset(
+    html.replace("{logo_url}", f"/logo.svg?v={logo_asset.version}").encode('utf-8'),
+    "text/html; charset=utf-8",
+    "no-cache",
+)
+
 @app.get("/")
-async def get():
-    return HTMLResponse(html)
+async def get(request: Request):
+    return page_asset.response(request)
+
+@app.get("/logo.svg")
+async def get_logo(request: Request):
+    return logo_asset.response(request)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Space event scoreboard server")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of uvicorn worker processes, sharing state through a local broker")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Start the broker first, the workers find it through the environment
+        broker_path = os.path.join(tempfile.gettempdir(), f"space-event-broker-{os.getpid()}.sock")
+        broker = Process(target=run_broker, args=(broker_path, SCORE_LOG_DIR or None), daemon=True)
+        broker.start()
+        os.environ["SCORE_BROKER"] = broker_path
+        try:
+            uvicorn.run("server:app", host="0.0.0.0", port=8000, workers=args.workers)
+        finally:
+            broker.terminate()
+            broker.join()
+            if os.path.exists(broker_path):
+                os.unlink(broker_path)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""A camera frame shared between processes through shared memory.
+
+The camera process publishes its annotated frame into a fixed size
+shared memory block and the game reads it from there, so frames never
+get pickled or pushed through a pipe. A sequence counter in front of
+the pixels works as a seqlock: it is odd while a frame is being
+written, and a reader that saw it change while reading knows the frame
+was torn and tries again on the next frame.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_SIZE = 8  # uint64 sequence counter
+
+
+class SharedFrame:
+    def __init__(self, shm, shape, owner):
+        self.shm = shm
+        self.shape = shape
+        self.owner = owner
+        self.seq = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf)
+        self.pixels = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=HEADER_SIZE)
+        self.nbytes = self.pixels.nbytes
+
+    @classmethod
+    def create(cls, shape):
+        size = HEADER_SIZE + int(np.prod(shape))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        frame = cls(shm, shape, owner=True)
+        frame.seq[0] = 0
+        return frame
+
+    @classmethod
+    def attach(cls, name, shape):
+        # Meant for child processes of the creator. They share its resource
+        # tracker, so the block is only cleaned up once, by the creator.
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, shape, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, image, flip=True):
+        """Copies image in. flip stores it bottom row first, as textures want it."""
+        self.seq[0] += 1  # Odd, writing
+        if flip:
+            np.copyto(self.pixels, image[::-1])
+        else:
+            np.copyto(self.pixels, image)
+        self.seq[0] += 1  # Even, done
+
+    def begin_read(self):
+        """Returns (seq, view of the pixel bytes), seq is None mid-write."""
+        seq = int(self.seq[0])
+        if seq & 1:
+            return None, None
+        return seq, self.shm.buf[HEADER_SIZE:HEADER_SIZE + self.nbytes]
+
+    def end_read(self, seq):
+        """True if the frame didn't change while it was being read."""
+        return int(self.seq[0]) == seq
+
+    def close(self):
+        # Views into the buffer have to go before it can be closed
+        self.seq = None
+        self.pixels = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
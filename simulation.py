@@ -0,0 +1,57 @@
+"""Fixed timestep gameplay for the lane games.
+
+The game advances in steps of exactly 1/rate seconds, however long the
+rendered frames take. Each frame runs as many steps as fit in the time
+that passed, and the entities are drawn between their last two
+simulated positions. Movement, spawns and the score ticker then behave
+the same on every cabinet. A step is short enough that nothing moves
+further than a collider's height, so even after a dropped frame a
+bullet can't pass through an invader between two checks.
+
+Moving entities keep their simulated position in sim_y, and prev_y is
+where the previous step left them. entity.y is only what is drawn.
+"""
+
+
+class FixedTimestep:
+    def __init__(self, rate=120, max_steps=8):
+        self.dt = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.time = 0.0  # Simulated seconds
+
+    def advance(self, frame_dt, step):
+        """Runs step(dt) for each whole step in frame_dt plus the leftover.
+
+        Returns how far the leftover is into the next step, from 0 to 1,
+        for interpolate(). After a hitch at most max_steps are run and
+        the rest of the time is dropped, so a slow frame slows the game
+        down once instead of making every following frame slower.
+        """
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.dt:
+            if steps == self.max_steps:
+                self.accumulator %= self.dt
+                break
+            step(self.dt)
+            self.time += self.dt
+            self.accumulator -= self.dt
+            steps += 1
+        return self.accumulator / self.dt
+
+
+def place(entity, y):
+    """Puts entity at y without interpolating from where it was, for spawns and resets."""
+    entity.sim_y = entity.prev_y = y
+    entity.y = y
+
+
+def move(entity, velocity, dt):
+    entity.prev_y = entity.sim_y
+    entity.sim_y += velocity * dt
+
+
+def interpolate(entities, alpha):
+    for entity in entities:
+        entity.y = entity.prev_y + (entity.sim_y - entity.prev_y) * alpha
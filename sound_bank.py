@@ -0,0 +1,32 @@
+"""Sound effects loaded once and played from a few reusable voices."""
+from ursina import Audio
+
+
+class SoundBank:
+    """Every sound is loaded when the game starts, never while it runs.
+
+    Each sound gets a fixed number of voices, Audio entities that are
+    made once and played again and again. play() picks a voice that is
+    done playing. When all of them are busy it restarts the one that
+    started longest ago, so rapid fire never stacks up more than
+    max_voices copies of a sound and never creates anything.
+    """
+
+    def __init__(self):
+        self.voices = {}
+
+    def load(self, name, path, max_voices=3, volume=1):
+        # Panda caches the decoded clip, the other voices reuse it
+        self.voices[name] = [Audio(path, volume=volume, autoplay=False) for _ in range(max_voices)]
+
+    def play(self, name):
+        voices = self.voices[name]
+        # Voices are kept in the order they were last started
+        for i, voice in enumerate(voices):
+            if not voice.playing:
+                break
+        else:
+            i = 0
+            voice = voices[0]
+        voice.play()
+        voices.append(voices.pop(i))
@@ -0,0 +1,111 @@
+"""Rolling per-stage timings of the camera loop, shared with the game.
+
+The camera process records how long each stage of a frame took into a
+window of the last few hundred frames in shared memory. Recording is a
+handful of float stores per frame. The game (or anyone holding the
+block) builds histograms and percentiles from the window only when it
+wants them, for the on-screen overlay or a dump to a file. The same
+seqlock as SharedFrame keeps a reader from mixing two frames.
+"""
+import json
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from metrics import LATENCY_BUCKETS
+
+HEADER_SIZE = 16  # uint64 sequence counter, uint64 frames recorded
+
+
+class StageTimings:
+    def __init__(self, shm, stages, window, owner):
+        self.shm = shm
+        self.stages = tuple(stages)
+        self.window = window
+        self.owner = owner
+        self.header = np.ndarray((2,), dtype=np.uint64, buffer=shm.buf)
+        self.samples = np.ndarray((window, len(self.stages)), dtype=np.float32, buffer=shm.buf, offset=HEADER_SIZE)
+        self.columns = {stage: i for i, stage in enumerate(self.stages)}
+
+    @classmethod
+    def create(cls, stages, window=300):
+        size = HEADER_SIZE + window * len(stages) * 4
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        timings = cls(shm, stages, window, owner=True)
+        timings.header[:] = 0
+        timings.samples[:] = 0
+        return timings
+
+    @classmethod
+    def attach(cls, name, stages, window=300):
+        # Same as SharedFrame.attach, for child processes of the creator
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, stages, window, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def record(self, timings):
+        """Writes one frame, timings maps stage names to seconds."""
+        row = self.samples[int(self.header[1]) % self.window]
+        self.header[0] += 1  # Odd, writing
+        row[:] = 0
+        for stage, seconds in timings.items():
+            row[self.columns[stage]] = seconds
+        self.header[1] += 1
+        self.header[0] += 1  # Even, done
+
+    def read(self):
+        """Copies the filled part of the window, None if it changed while copying."""
+        seq = int(self.header[0])
+        if seq & 1:
+            return None
+        frames = int(self.header[1])
+        samples = self.samples[:min(frames, self.window)].copy()
+        if int(self.header[0]) != seq:
+            return None
+        return frames, samples
+
+    def snapshot(self, retries=3):
+        """Rolling stats per stage, in milliseconds, or None if the camera kept writing."""
+        for _ in range(retries):
+            copied = self.read()
+            if copied is not None:
+                break
+        else:
+            return None
+
+        frames, samples = copied
+        stats = {"frames": frames, "window": len(samples), "stages": {}}
+        if not len(samples):
+            return stats
+        for stage, column in self.columns.items():
+            values = samples[:, column].astype(np.float64)
+            counts = np.bincount(np.searchsorted(LATENCY_BUCKETS, values), minlength=len(LATENCY_BUCKETS) + 1)
+            stats["stages"][stage] = {
+                "mean_ms": float(values.mean()) * 1000,
+                "p50_ms": float(np.percentile(values, 50)) * 1000,
+                "p99_ms": float(np.percentile(values, 99)) * 1000,
+                "max_ms": float(values.max()) * 1000,
+                # Frames per bucket, bucket upper bounds in seconds with +Inf last
+                "histogram": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], counts.tolist())),
+            }
+        return stats
+
+    def dump(self, path):
+        stats = self.snapshot()
+        if stats is None:
+            return False
+        stats["time"] = time.time()
+        with open(path, "w") as f:
+            json.dump(stats, f, indent=2)
+        return True
+
+    def close(self):
+        self.header = None
+        self.samples = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()